@@ -1,216 +1,340 @@
 # src/infrastructure/api.py
 from fastapi import FastAPI, UploadFile, File, Depends, HTTPException, Query, BackgroundTasks
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from sqlalchemy import text, func, literal_column
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterable, Iterator
 import os
+import io
+import csv
 import uuid
-import json
+import orjson
+import base64
 import logging
 import time
+import asyncio
+import operator
+import functools
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from enum import Enum
 
-from src.core.models import Document, ExtractedData
+from src.core.models import Document, ExtractedData, DocumentSummary
 from src.services.ports import IExtractionService
-from src.adapters.dependencies import get_extraction_service, get_db
+from src.adapters.dependencies import get_extraction_service, extraction_service_dep, get_db, SessionLocal, engine
+from src.adapters.database.models import DocumentRecord, DocumentTableRow
+from src.adapters.hashing import compute_file_hash, new_file_hasher
+from src.adapters.repositories import store_table_rows, build_tables_text, rekey_legacy_document
+from src.adapters.serialization import dump_json
 from src.config.app_config import config
 
-def _limit_table_rows(table_rows: List[List[str]], max_rows: int = None) -> tuple[List[List[str]], dict]:
+class FastJSONResponse(ORJSONResponse):
     """
-    Limit table rows to prevent browser crashes and return metadata about truncation.
-    
-    Returns:
-        tuple: (limited_rows, metadata)
+    ORJSONResponse using the service's orjson options.
+    Endpoints return it directly instead of a plain dict, which skips FastAPI's
+    recursive jsonable_encoder pass over the response.
     """
-    if max_rows is None:
-        max_rows = config.large_file.max_storage_rows
-    
-    if not table_rows or len(table_rows) <= max_rows:
-        return table_rows, {
-            'is_truncated': False,
-            'original_row_count': len(table_rows) if table_rows else 0,
-            'stored_row_count': len(table_rows) if table_rows else 0
-        }
+    def render(self, content: Any) -> bytes:
+        return dump_json(content)
+
+# Upload streaming: read in 1 MiB chunks
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+# Directory shared between the API and Celery workers for async and batch uploads
+SHARED_UPLOAD_DIR = os.getenv('SHARED_UPLOAD_DIR', os.path.join(tempfile.gettempdir(), 'extraction_uploads'))
+# Uploads up to this size travel inline (base64) in the task payload; larger ones
+# are written to SHARED_UPLOAD_DIR, which must then be mounted on the workers too
+TASK_INLINE_MAX_SIZE = int(os.getenv('TASK_INLINE_MAX_SIZE', 1024 * 1024))
+
+async def _build_task_payload(file: UploadFile) -> dict:
+    """
+    Stream an upload into a Celery task payload, hashing it on the way.
+    Small uploads are embedded as base64; larger ones are written to the shared
+    upload directory and the payload references the stored file.
+    """
+    hasher = new_file_hasher()
+    inline = bytearray()
+    stored_file = None
+    try:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            hasher.update(chunk)
+            if stored_file is None and len(inline) + len(chunk) <= TASK_INLINE_MAX_SIZE:
+                inline += chunk
+                continue
+            if stored_file is None:
+                os.makedirs(SHARED_UPLOAD_DIR, exist_ok=True)
+                stored_file = tempfile.NamedTemporaryFile(dir=SHARED_UPLOAD_DIR, delete=False)
+                stored_file.write(inline)
+                inline = bytearray()
+            stored_file.write(chunk)
+    except BaseException:
+        if stored_file is not None:
+            stored_file.close()
+            os.unlink(stored_file.name)
+        raise
+    
+    payload = {'filename': file.filename, 'file_hash': hasher.hexdigest()}
+    if stored_file is None:
+        payload['content'] = base64.b64encode(inline).decode('ascii')
+    else:
+        stored_file.close()
+        payload['path'] = stored_file.name
+    return payload
+
+async def _fail_unqueued_tasks(task_ids: Iterable[str], error: Exception):
+    """Mark tasks that could not be enqueued as failed, instead of leaving them pending."""
+    try:
+        await _write_task_fields({
+            task_id: {"status": TaskStatus.FAILED, "error": f"Could not enqueue task: {error}"}
+            for task_id in task_ids
+        })
+    except Exception as e:
+        logger.error(f"Could not mark unqueued tasks as failed: {e}")
+
+def _discard_task_payloads(payloads: Iterable[dict]):
+    """Remove the stored files of task payloads that were never enqueued."""
+    for payload in payloads:
+        path = payload.get('path')
+        if path and os.path.exists(path):
+            os.unlink(path)
+
+async def _read_upload(file: UploadFile) -> Document:
+    """
+    Stream an upload in chunks through the deduplication hasher.
+    Hashing overlaps with reading, so no separate full pass over the content is needed.
+    The chunks are joined into the document content once, without an intermediate buffer.
+    """
+    hasher = new_file_hasher()
+    chunks = []
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        hasher.update(chunk)
+        chunks.append(chunk)
+    return Document(content=b"".join(chunks), filename=file.filename, file_hash=hasher.hexdigest())
+
+# Table attributes copied into API/task responses, grouped by purpose
+_TABLE_SUMMARY_FIELDS = (
+    "table_index", "page_number", "title", "row_count", "column_count",
+    "table_type", "confidence_score", "extraction_method"
+)
+_TABLE_CONTEXT_FIELDS = ("context_before", "context_after", "section_heading", "headers")
+_TABLE_TRUNCATION_FIELDS = ("is_truncated", "original_row_count", "stored_row_count")
+_TABLE_STORAGE_FIELDS = ("is_truncated", "truncation_reason", "original_row_count", "stored_row_count")
+
+@functools.lru_cache(maxsize=None)
+def _table_field_getter(fields: tuple):
+    """Precompiled getter returning all requested attributes as one tuple."""
+    return operator.attrgetter(*fields)
+
+def _serialize_table(table, *field_groups: tuple, row_preview: Optional[int] = None) -> dict:
+    """
+    Build a response dict from a DocumentTable's attributes.
     
-    # Truncate rows
-    limited_rows = table_rows[:max_rows]
-    metadata = {
-        'is_truncated': True,
-        'original_row_count': len(table_rows),
-        'stored_row_count': len(limited_rows),
-        'truncation_reason': 'Large table truncated to prevent browser crashes'
-    }
+    Args:
+        table: DocumentTable to serialize
+        field_groups: Attribute name tuples to include (defaults to the summary fields)
+        row_preview: If set, include at most this many rows as 'rows_preview'
+    """
+    fields = sum(field_groups, ()) if field_groups else _TABLE_SUMMARY_FIELDS
+    table_dict = dict(zip(fields, _table_field_getter(fields)(table)))
     
-    logger.warning(f"Large table detected ({len(table_rows)} rows). Truncated to {max_rows} rows to prevent memory issues.")
+    if row_preview is not None and table.rows:
+        total_rows = len(table.rows)
+        table_dict['rows_preview'] = table.rows[:row_preview]
+        table_dict['preview_truncated'] = total_rows > row_preview
+        table_dict['total_rows_available'] = total_rows
     
-    return limited_rows, metadata
+    return table_dict
 
 logger = logging.getLogger(__name__)
 
-# Check if production dependencies are available
+def _find_document_by_hash(db: Session, file_hash: str, file_size: int, content: Optional[bytes] = None):
+    """
+    Look up an already stored document by content hash.
+    The file size is compared as well to guard against 64-bit hash collisions.
+    If content is given, a document stored under the SHA-256 hash of earlier
+    versions is found too (and re-keyed to file_hash).
+    """
+    query = db.query(DocumentRecord).filter(
+        DocumentRecord.file_hash == file_hash,
+        DocumentRecord.file_size == file_size
+    )
+    existing = query.first()
+    if existing is None and content is not None and rekey_legacy_document(db, content, file_hash):
+        # Committed right away: extraction workers look the document up in sessions of their own
+        db.commit()
+        existing = query.first()
+    return existing
+
+def _upsert_document(db: Session, values: dict, update_fields: tuple = (), content: Optional[bytes] = None) -> tuple[int, bool]:
+    """
+    Insert a document row in one atomic statement, resolving duplicates on (file_hash, file_size).
+    
+    An existing row gets the values of update_fields, or is left unchanged if none are given.
+    If content is given, a row stored under the SHA-256 hash of earlier versions is
+    re-keyed first, so it counts as a duplicate too.
+    Returns (document_id, inserted).
+    """
+    if "tables_data" in values:
+        # Searchable table text for the generated search_vector column
+        values = {**values, "tables_text": build_tables_text(values["tables_data"])}
+        if "tables_data" in update_fields:
+            update_fields = (*update_fields, "tables_text")
+    
+    if content is not None:
+        rekey_legacy_document(db, content, values["file_hash"])
+    
+    stmt = insert(DocumentRecord).values(**values)
+    conflict_columns = [DocumentRecord.file_hash, DocumentRecord.file_size]
+    if update_fields:
+        set_ = {field: stmt.excluded[field] for field in update_fields}
+        set_["updated_at"] = func.now()  # onupdate is not applied to ON CONFLICT updates
+        stmt = stmt.on_conflict_do_update(index_elements=conflict_columns, set_=set_)
+    else:
+        stmt = stmt.on_conflict_do_nothing(index_elements=conflict_columns)
+    
+    # xmax is 0 only for rows inserted by this statement
+    row = db.execute(stmt.returning(DocumentRecord.id, literal_column("xmax = 0"))).first()
+    if row is None:
+        # DO NOTHING returns no row for duplicates
+        db.commit()
+        return _find_document_by_hash(db, values["file_hash"], values["file_size"]).id, False
+    
+    document_id, inserted = row
+    if inserted or "tables_data" in update_fields:
+        store_table_rows(db, document_id, values.get("tables_data"))
+    db.commit()
+    return document_id, inserted
+
+# Task backend: Celery + Redis when available, BackgroundTasks otherwise.
+# Selected by init_task_backend() at application startup, not at import time.
 USE_CELERY = False
-try:
+redis_client = None
+result_backend_client = None
+celery_app = None
+process_document_task = None
+# Simple task store for development
+task_store: Dict[str, Dict[str, Any]] = {}
+
+REDIS_CONNECT_ATTEMPTS = int(os.getenv('REDIS_CONNECT_ATTEMPTS', 3))
+REDIS_CONNECT_TIMEOUT = float(os.getenv('REDIS_CONNECT_TIMEOUT', 2.0))  # seconds per ping
+
+# Connection settings shared by the task status and result backend clients:
+# dead pooled sockets are detected by keepalive/health checks instead of stalling a request
+REDIS_CONNECTION_OPTIONS = {
+    "socket_timeout": float(os.getenv('REDIS_SOCKET_TIMEOUT', 2.0)),
+    "socket_keepalive": True,
+    "health_check_interval": int(os.getenv('REDIS_HEALTH_CHECK_INTERVAL', 30)),
+}
+
+# Celery queues by workload, so quick tabular files don't wait behind long PDF/OCR extractions
+TABULAR_TASK_QUEUE = os.getenv('CELERY_TABULAR_QUEUE', 'tabular')
+DOCUMENT_TASK_QUEUE = os.getenv('CELERY_DOCUMENT_QUEUE', 'documents')
+
+def _task_queue(filename: str) -> str:
+    """Pick the Celery queue for an upload from its file extension."""
+    if filename and filename.lower().endswith(('.csv', '.tsv', '.xlsx', '.xls')):
+        return TABULAR_TASK_QUEUE
+    return DOCUMENT_TASK_QUEUE
+
+def _run_document_task(document_data: dict) -> dict:
+    """Celery task for document processing."""
+    # Large uploads are passed as a reference to a file in shared storage, small
+    # ones inline as base64 (see _build_task_payload)
+    shared_path = document_data.get('path')
+    if shared_path:
+        with open(shared_path, 'rb') as f:
+            content = f.read()
+    else:
+        content = base64.b64decode(document_data['content'])
+    document = Document(content=content, filename=document_data['filename'], file_hash=document_data.get('file_hash'))
+    
+    db = SessionLocal()
+    try:
+        # Only the compact, size-limited result goes to the result backend
+        return _process_document_for_task(document, db)
+    finally:
+        db.close()
+        if shared_path and os.path.exists(shared_path):
+            os.unlink(shared_path)
+
+@functools.lru_cache(maxsize=None)
+def get_celery_app():
+    """
+    Create the Celery app and register the processing task.
+    No broker connection is made until a task is sent.
+    """
     import celery
-    import redis
-    
-    # Test Redis connection
-    redis_client = redis.Redis(
-        host=os.getenv('REDIS_HOST', 'localhost'),
-        port=int(os.getenv('REDIS_PORT', 6379)),
-        db=int(os.getenv('REDIS_DB', 0)),
-        decode_responses=True
-    )
-    redis_client.ping()
     
-    # Setup Celery
-    celery_app = celery.Celery(
+    app = celery.Celery(
         'document_processor',
         broker=os.getenv('CELERY_BROKER_URL', 'redis://localhost:6379/0'),
         backend=os.getenv('CELERY_RESULT_BACKEND', 'redis://localhost:6379/0')
     )
     
-    @celery_app.task
-    def process_document_task(document_data: dict) -> dict:
-        """Celery task for document processing."""
-        import base64
-        import time
-        import hashlib
-        from src.core.models import Document
-        from src.adapters.dependencies import get_extraction_service, SessionLocal
-        from src.services.tabular_processor import TabularProcessor
-        from src.adapters.database.models import DocumentRecord
-        
-        content = base64.b64decode(document_data['content'])
-        document = Document(content=content, filename=document_data['filename'])
+    # Expire stored results so the result backend doesn't accumulate old payloads
+    app.conf.result_expires = 3600
+    # Broker connections kept open per process, sized like the task status pool
+    app.conf.broker_pool_limit = int(os.getenv('REDIS_MAX_CONNECTIONS', 32))
+    # Long extractions shouldn't hold prefetched tasks hostage
+    app.conf.task_default_queue = DOCUMENT_TASK_QUEUE
+    app.conf.worker_prefetch_multiplier = 1
+    
+    app.task(name='process_document_task')(_run_document_task)
+    return app
+
+async def _ping_redis(client) -> None:
+    """Ping Redis, retrying with exponential backoff; raises the last error if all attempts fail."""
+    for attempt in range(REDIS_CONNECT_ATTEMPTS):
+        try:
+            await asyncio.wait_for(client.ping(), timeout=REDIS_CONNECT_TIMEOUT)
+            return
+        except Exception:
+            if attempt == REDIS_CONNECT_ATTEMPTS - 1:
+                raise
+            await asyncio.sleep(0.5 * 2 ** attempt)
+
+async def init_task_backend():
+    """Use Celery + Redis if the production dependencies are installed and Redis is reachable."""
+    global USE_CELERY, redis_client, result_backend_client, celery_app, process_document_task
+    
+    try:
+        import redis.asyncio
         
-        db = SessionLocal()
+        # Pooled async client shared by all requests (avoids serializing on one socket).
+        # Raw bytes responses: status values are parsed by orjson straight from bytes
+        redis_pool = redis.asyncio.BlockingConnectionPool(
+            max_connections=int(os.getenv('REDIS_MAX_CONNECTIONS', 32)),
+            host=os.getenv('REDIS_HOST', 'localhost'),
+            port=int(os.getenv('REDIS_PORT', 6379)),
+            db=int(os.getenv('REDIS_DB', 0)),
+            decode_responses=False,
+            **REDIS_CONNECTION_OPTIONS
+        )
+        client = redis.asyncio.Redis(connection_pool=redis_pool)
         try:
-            # Check if this is a tabular file and handle as table
-            if _is_tabular_file(document.filename, content):
-                # Process as tabular data
-                start_time = time.time()
-                
-                # Detect file type
-                file_type = TabularProcessor.detect_file_type(document.filename, content)
-                if not file_type:
-                    raise ValueError("Unable to detect tabular file type")
-                
-                # Load as DataFrame
-                df = TabularProcessor.load_dataframe(content, file_type, document.filename)
-                
-                # Create table data structure
-                table_data = TabularProcessor.create_table_data(df, file_type, document.filename)
-                
-                # Store in database
-                file_hash = hashlib.sha256(content).hexdigest()
-                
-                # Check for existing document
-                existing_doc = db.query(DocumentRecord).filter(DocumentRecord.file_hash == file_hash).first()
-                if existing_doc:
-                    document_id = existing_doc.id
-                    action = "duplicate"
-                else:
-                    # Create new document record
-                    db_document = DocumentRecord(
-                        filename=document.filename,
-                        file_extension=f".{file_type}",
-                        file_size=len(content),
-                        file_hash=file_hash,
-                        full_text="",  # Tabular files don't have full text
-                        page_count=1,
-                        word_count=len(df) * len(df.columns),
-                        processing_method=f"tabular_{file_type}",
-                        has_ocr_content=0,  # Convert boolean False to integer 0
-                        tables_data=table_data,
-                        table_count=1
-                    )
-                    
-                    db.add(db_document)
-                    db.commit()
-                    db.refresh(db_document)
-                    document_id = db_document.id
-                    action = "created"
-                
-                processing_time = int((time.time() - start_time) * 1000)
-                
-                # Create result with size limits for Celery task
-                celery_result = {
-                    "id": document_id,
-                    "filename": document.filename,
-                    "action": action,
-                    "processing_time_ms": processing_time,
-                    "file_size_bytes": len(content),
-                    "data_format": "table",
-                    "table_preview": TabularProcessor.get_preview_data(df),  # Already limited
-                    "table_info": {
-                        "shape": f"{len(df)} rows × {len(df.columns)} columns",
-                        "columns": list(df.columns),
-                        "data_types": {col: str(df[col].dtype) for col in df.columns}
-                    },
-                    "data_quality": TabularProcessor.analyze_data_quality(df)
-                }
-                
-                # Apply size limits to prevent browser crashes in async responses
-                return _apply_size_limits_to_task_result(celery_result)
-            else:
-                # Regular document processing
-                service = get_extraction_service(db)
-                result = service.extract_from_document(document)
-                
-                # Create result for Celery task with size limits
-                celery_result = {
-                    'id': getattr(result, 'id', None),
-                    'filename': document_data['filename'],
-                    'page_count': result.page_count,
-                    'processing_method': result.processing_method,
-                    'has_ocr_content': result.has_ocr_content,
-                    'text_preview': result.full_text[:200] + "..." if len(result.full_text) > 200 else result.full_text,
-                    'table_count': result.table_count
-                }
-                
-                # Include limited table data if present
-                if hasattr(result, 'tables') and result.tables:
-                    limited_tables = []
-                    for table in result.tables:
-                        table_dict = {
-                            "table_index": table.table_index,
-                            "page_number": table.page_number,
-                            "title": table.title,
-                            "row_count": table.row_count,
-                            "column_count": table.column_count,
-                            "table_type": table.table_type,
-                            "confidence_score": table.confidence_score,
-                            "extraction_method": table.extraction_method,
-                            # Include truncation metadata
-                            "is_truncated": getattr(table, 'is_truncated', False),
-                            "original_row_count": getattr(table, 'original_row_count', table.row_count),
-                            "stored_row_count": getattr(table, 'stored_row_count', table.row_count)
-                        }
-                        
-                        # Add limited row data (preview only for Celery results)
-                        if table.rows:
-                            from src.config.app_config import config
-                            preview_size = min(config.large_file.max_response_rows, len(table.rows))
-                            table_dict['rows_preview'] = table.rows[:preview_size]
-                            table_dict['preview_truncated'] = len(table.rows) > preview_size
-                            table_dict['total_rows_available'] = len(table.rows)
-                        
-                        limited_tables.append(table_dict)
-                    
-                    celery_result['tables'] = limited_tables
-                
-                # Apply size limits to prevent browser crashes in async responses
-                return _apply_size_limits_to_task_result(celery_result)
-        finally:
-            db.close()
-    
-    USE_CELERY = True
-    logger.info("Using Celery + Redis for task processing")
-    
-except Exception as e:
-    logger.info(f"Using BackgroundTasks for task processing: {e}")
-    # Simple task store for development
-    task_store: Dict[str, Dict[str, Any]] = {}
+            await _ping_redis(client)
+        except Exception:
+            await redis_pool.disconnect()
+            raise
+        
+        tasks_app = get_celery_app()
+        celery_backend_url = tasks_app.conf.result_backend
+        # Async client for reading Celery result metadata directly (Redis result backends only)
+        result_backend_client = (
+            redis.asyncio.Redis.from_url(celery_backend_url, **REDIS_CONNECTION_OPTIONS)
+            if celery_backend_url.startswith(('redis://', 'rediss://')) else None
+        )
+        
+        redis_client = client
+        celery_app = tasks_app
+        process_document_task = tasks_app.tasks['process_document_task']
+        USE_CELERY = True
+        logger.info("Using Celery + Redis for task processing")
+        
+    except Exception as e:
+        logger.info(f"Using BackgroundTasks for task processing: {e}")
 
 class TaskStatus(str, Enum):
     PENDING = "pending"
@@ -221,212 +345,317 @@ class TaskStatus(str, Enum):
 app = FastAPI(
     title="Data Extraction Service",
     description="Document processing with async support",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=FastJSONResponse
 )
 
+@app.on_event("startup")
+async def startup_task_backend():
+    await init_task_backend()
+
+# Process pool for CPU-bound document extraction (keeps the event loop responsive)
+EXTRACTION_POOL_WORKERS = int(os.getenv('EXTRACTION_POOL_WORKERS', os.cpu_count() or 1))
+_extraction_pool: Optional[ProcessPoolExecutor] = None
+
+def _init_extraction_worker():
+    """Discard database connections inherited from the parent process; they are not fork-safe."""
+    engine.dispose(close=False)
+
+def _get_extraction_pool() -> ProcessPoolExecutor:
+    """Create the extraction process pool on first use."""
+    global _extraction_pool
+    if _extraction_pool is None:
+        _extraction_pool = ProcessPoolExecutor(
+            max_workers=EXTRACTION_POOL_WORKERS,
+            initializer=_init_extraction_worker
+        )
+    return _extraction_pool
+
+def _extract_in_worker(document: Document) -> ExtractedData:
+    """Run the blocking extraction pipeline in a pool process with its own database session."""
+    db = SessionLocal()
+    try:
+        return get_extraction_service(db).extract_from_document(document)
+    finally:
+        db.close()
+
+def _process_task_in_worker(document: Document) -> dict:
+    """Run the async-task processing pipeline in a pool process with its own database session."""
+    db = SessionLocal()
+    try:
+        return _process_document_for_task(document, db)
+    finally:
+        db.close()
+
+# Snapshot cache for frequently polled, slowly changing endpoints (/tables/stats, /health)
+_snapshot_cache: Dict[str, tuple[float, Any, Any]] = {}
+_snapshot_lock = asyncio.Lock()
+
+async def _get_cached_snapshot(key: str, ttl_ms: int, compute, watermark=None):
+    """
+    Return a cached snapshot if it is younger than ttl_ms, otherwise recompute it.
+    ttl_ms=0 forces a fresh read. The timestamp is taken after compute() finishes,
+    so a slow computation doesn't eat into the snapshot's lifetime.
+    
+    watermark is an optional callable returning a cheap fingerprint of the source
+    data. It is only evaluated once the snapshot has expired: if the fingerprint
+    hasn't changed, the snapshot is kept for another ttl_ms instead of recomputed.
+    """
+    def _is_fresh(cached) -> bool:
+        return bool(cached) and ttl_ms > 0 and time.monotonic() - cached[0] < ttl_ms / 1000
+    
+    cached = _snapshot_cache.get(key)
+    if _is_fresh(cached):
+        return cached[2]
+    
+    async with _snapshot_lock:
+        # Another request may have refreshed the snapshot while we waited
+        cached = _snapshot_cache.get(key)
+        if _is_fresh(cached):
+            return cached[2]
+        
+        # compute() and watermark() run blocking queries; keep them off the event loop
+        current_watermark = None
+        if watermark is not None and ttl_ms > 0:
+            current_watermark = await asyncio.to_thread(watermark)
+            if cached and cached[1] == current_watermark:
+                _snapshot_cache[key] = (time.monotonic(), current_watermark, cached[2])
+                return cached[2]
+        
+        value = await asyncio.to_thread(compute)
+        _snapshot_cache[key] = (time.monotonic(), current_watermark, value)
+        return value
+
 # Task management functions
-def store_task_status(task_id: str, status: dict):
+TASK_STATUS_TTL = 3600  # seconds
+
+async def _write_task_fields(task_fields: Dict[str, dict], replace: bool = False):
+    """
+    Write status fields of one or more tasks to Redis hashes in a single pipelined round-trip.
+    Each field is stored separately, so updates don't need to read the current status first.
+    """
+    async with redis_client.pipeline(transaction=True) as pipe:
+        for task_id, fields in task_fields.items():
+            key = f"task:{task_id}"
+            if replace:
+                pipe.delete(key)
+            pipe.hset(key, mapping={field: dump_json(value) for field, value in fields.items()})
+            pipe.expire(key, TASK_STATUS_TTL)
+        await pipe.execute()
+
+async def store_task_status(task_id: str, status: dict):
     """Store task status."""
+    await store_task_statuses({task_id: status})
+
+async def store_task_statuses(statuses: Dict[str, dict]):
+    """Store the status of several tasks at once (one Redis round-trip)."""
     if USE_CELERY:
-        redis_client.setex(f"task:{task_id}", 3600, json.dumps(status))
+        await _write_task_fields(statuses, replace=True)
     else:
-        task_store[task_id] = status
+        task_store.update(statuses)
 
-def get_task_status(task_id: str) -> Optional[dict]:
+async def get_task_status(task_id: str) -> Optional[dict]:
     """Get task status."""
     if USE_CELERY:
-        data = redis_client.get(f"task:{task_id}")
-        return json.loads(data) if data else None
+        return _decode_task_fields(await redis_client.hgetall(f"task:{task_id}"))
     else:
         return task_store.get(task_id)
 
-def update_task_status(task_id: str, updates: dict):
+def _decode_task_fields(fields: Dict[bytes, bytes]) -> Optional[dict]:
+    """Decode the orjson-encoded fields of a task status hash."""
+    return {field.decode(): orjson.loads(value) for field, value in fields.items()} if fields else None
+
+def _task_fields_to_json(fields: Dict[bytes, bytes]) -> bytes:
+    """Join the orjson-encoded fields of a task status hash into one JSON object without decoding them."""
+    return b'{' + b','.join(dump_json(field.decode()) + b':' + value for field, value in fields.items()) + b'}'
+
+async def update_task_status(task_id: str, updates: dict):
     """Update task status."""
     if USE_CELERY:
-        current = get_task_status(task_id) or {}
-        current.update(updates)
-        redis_client.setex(f"task:{task_id}", 3600, json.dumps(current))
+        await _write_task_fields({task_id: updates})
     else:
         if task_id in task_store:
             task_store[task_id].update(updates)
 
+# Shared processing for async tasks (Celery and BackgroundTasks)
+TASK_RESULT_MAX_TABLES = 20  # Tables summarized in an async task result
+
+def _build_tabular_task_result(document: Document, db: Session) -> dict:
+    """Process a tabular upload, store it, and build the task result."""
+    from src.services.tabular_processor import TabularProcessor
+    
+    start_time = time.time()
+    content = document.content
+    
+    # Detect file type
+    file_type = TabularProcessor.detect_file_type(document.filename, content)
+    if not file_type:
+        raise ValueError("Unable to detect tabular file type")
+    
+    # Load as DataFrame
+    df = TabularProcessor.load_dataframe(content, file_type, document.filename)
+    
+    # Create table data structure
+    table_data = TabularProcessor.create_table_data(df, file_type, document.filename)
+    
+    # Store in database; an already stored duplicate is left as it is
+    document_id, inserted = _upsert_document(db, dict(
+        filename=document.filename,
+        file_extension=f".{file_type}",
+        file_size=len(content),
+        file_hash=document.file_hash or compute_file_hash(content),
+        full_text="",  # Tabular files don't have full text
+        page_count=1,
+        word_count=len(df) * len(df.columns),
+        processing_method=f"tabular_{file_type}",
+        has_ocr_content=False,
+        tables_data=[table_data],  # Same list layout as every other document
+        table_count=1
+    ), content=content)
+    action = "created" if inserted else "duplicate"
+    
+    processing_time = int((time.time() - start_time) * 1000)
+    
+    return {
+        "id": document_id,
+        "filename": document.filename,
+        "action": action,
+        "processing_time_ms": processing_time,
+        "file_size_bytes": len(content),
+        "data_format": "table",
+        "table_preview": TabularProcessor.get_preview_data(df),  # Already limited by get_preview_data
+        "table_info": {
+            "shape": f"{len(df)} rows × {len(df.columns)} columns",
+            "columns": list(df.columns),
+            "data_types": df.dtypes.astype(str).to_dict()
+        },
+        "data_quality": TabularProcessor.analyze_data_quality(df)
+    }
+
+def _build_task_result(result: ExtractedData, filename: str) -> dict:
+    """
+    Build the compact result of a document extraction task.
+    The full text and table rows stay in Postgres; only previews are returned.
+    """
+    task_result = {
+        "id": result.id,
+        "filename": filename,
+        "page_count": result.page_count,
+        "processing_method": result.processing_method,
+        "has_ocr_content": result.has_ocr_content,
+        "text_preview": result.full_text[:200] + "..." if len(result.full_text) > 200 else result.full_text,
+        "table_count": result.table_count
+    }
+    
+    # Include limited table data if present
+    if result.tables:
+        # Summary with truncation metadata and a row preview only for async results
+        max_rows = config.large_file.max_response_rows
+        task_result['tables'] = [
+            _serialize_table(
+                table, _TABLE_SUMMARY_FIELDS, _TABLE_TRUNCATION_FIELDS,
+                row_preview=max_rows
+            )
+            for table in result.tables[:TASK_RESULT_MAX_TABLES]
+        ]
+        task_result['tables_truncated'] = len(result.tables) > TASK_RESULT_MAX_TABLES
+    
+    return task_result
+
+def _process_document_for_task(document: Document, db: Session) -> dict:
+    """Process a document for an async task and return its size-limited result."""
+    # Check if this is a tabular file and handle as table
+    if _is_tabular_file(document.filename):
+        task_result = _build_tabular_task_result(document, db)
+    else:
+        # Regular document processing
+        result = get_extraction_service(db).extract_from_document(document)
+        task_result = _build_task_result(result, document.filename)
+    
+    # Apply additional size limits to prevent browser crashes
+    return _apply_size_limits_to_task_result(task_result)
+
+def _initial_task_status(task_id: str, filename: str) -> dict:
+    """Build the status stored when a task is submitted."""
+    status = {
+        "task_id": task_id,
+        "status": TaskStatus.PENDING,
+        "filename": filename,
+        "created_at": datetime.now().isoformat()
+    }
+    if USE_CELERY:
+        status["celery_task_id"] = task_id
+    return status
+
+async def _get_celery_task_meta(task_id: str) -> Optional[dict]:
+    """
+    Read a Celery task's result metadata ({'status', 'result', ...}).
+    Redis result backends are read directly with one async GET; other backends go through AsyncResult.
+    """
+    if result_backend_client is None:
+        celery_task = celery_app.AsyncResult(task_id)
+        return {"status": celery_task.state, "result": celery_task.info}
+    
+    payload = await result_backend_client.get(celery_app.backend.get_key_for_task(task_id))
+    return celery_app.backend.decode_result(payload) if payload else None
+
 # Background processing for development
-async def process_document_background(task_id: str, document: Document, db: Session):
-    """Process document in background."""
-    try:
-        update_task_status(task_id, {"status": TaskStatus.PROCESSING})
-        
-        # Check if this is a tabular file and handle as table
-        if _is_tabular_file(document.filename, document.content):
-            # Process as tabular data
-            import time
-            from src.services.tabular_processor import TabularProcessor
-            import hashlib
-            from src.adapters.database.models import DocumentRecord
-            
-            start_time = time.time()
-            
-            # Detect file type
-            file_type = TabularProcessor.detect_file_type(document.filename, document.content)
-            if not file_type:
-                raise ValueError("Unable to detect tabular file type")
-            
-            # Load as DataFrame
-            df = TabularProcessor.load_dataframe(document.content, file_type, document.filename)
-            
-            # Create table data structure
-            table_data = TabularProcessor.create_table_data(df, file_type, document.filename)
-            
-            # Store in database
-            file_hash = hashlib.sha256(document.content).hexdigest()
-            
-            # Check for existing document
-            existing_doc = db.query(DocumentRecord).filter(DocumentRecord.file_hash == file_hash).first()
-            if existing_doc:
-                document_id = existing_doc.id
-                action = "duplicate"
-            else:
-                # Create new document record
-                db_document = DocumentRecord(
-                    filename=document.filename,
-                    file_extension=f".{file_type}",
-                    file_size=len(document.content),
-                    file_hash=file_hash,
-                    full_text="",  # Tabular files don't have full text
-                    page_count=1,
-                    word_count=len(df) * len(df.columns),
-                    processing_method=f"tabular_{file_type}",
-                    has_ocr_content=0,  # Convert boolean False to integer 0
-                    tables_data=table_data,
-                    table_count=1
-                )
-                
-                db.add(db_document)
-                db.commit()
-                db.refresh(db_document)
-                document_id = db_document.id
-                action = "created"
-            
-            processing_time = int((time.time() - start_time) * 1000)
-            
-            # Create result with size limits applied
-            task_result = {
-                "id": document_id,
-                "filename": document.filename,
-                "action": action,
-                "processing_time_ms": processing_time,
-                "file_size_bytes": len(document.content),
-                "data_format": "table",
-                "table_preview": TabularProcessor.get_preview_data(df),  # Already limited by get_preview_data
-                "table_info": {
-                    "shape": f"{len(df)} rows × {len(df.columns)} columns",
-                    "columns": list(df.columns),
-                    "data_types": {col: str(df[col].dtype) for col in df.columns}
-                },
-                "data_quality": TabularProcessor.analyze_data_quality(df)
-            }
+BACKGROUND_TASK_CONCURRENCY = int(os.getenv('BACKGROUND_TASK_CONCURRENCY', '8'))
+_background_semaphore = asyncio.Semaphore(BACKGROUND_TASK_CONCURRENCY)
+
+async def process_document_background(task_id: str, document: Document):
+    """
+    Process document in background.
+    Extraction runs in the process pool with its own database session, so it neither
+    blocks the event loop nor shares the request-scoped session.
+    """
+    async with _background_semaphore:
+        try:
+            await update_task_status(task_id, {"status": TaskStatus.PROCESSING})
             
-            # Apply additional size limits to prevent browser crashes
-            limited_result = _apply_size_limits_to_task_result(task_result)
+            loop = asyncio.get_running_loop()
+            limited_result = await loop.run_in_executor(
+                _get_extraction_pool(), _process_task_in_worker, document
+            )
             
-            update_task_status(task_id, {
+            await update_task_status(task_id, {
                 "status": TaskStatus.COMPLETED,
                 "result": limited_result
             })
-        else:
-            # Regular document processing
-            service = get_extraction_service(db)
-            result = service.extract_from_document(document)
-            
-            # Create result for regular documents
-            task_result = {
-                "id": getattr(result, 'id', None),
-                "filename": document.filename,
-                "page_count": result.page_count,
-                "processing_method": result.processing_method,
-                "has_ocr_content": result.has_ocr_content,
-                "text_preview": result.full_text[:200] + "..." if len(result.full_text) > 200 else result.full_text,
-                "table_count": result.table_count
-            }
-            
-            # Include limited table data if present
-            if hasattr(result, 'tables') and result.tables:
-                # Convert tables to serializable format with size limits
-                limited_tables = []
-                for table in result.tables:
-                    table_dict = {
-                        "table_index": table.table_index,
-                        "page_number": table.page_number,
-                        "title": table.title,
-                        "row_count": table.row_count,
-                        "column_count": table.column_count,
-                        "table_type": table.table_type,
-                        "confidence_score": table.confidence_score,
-                        "extraction_method": table.extraction_method,
-                        # Include truncation metadata
-                        "is_truncated": getattr(table, 'is_truncated', False),
-                        "original_row_count": getattr(table, 'original_row_count', table.row_count),
-                        "stored_row_count": getattr(table, 'stored_row_count', table.row_count)
-                    }
-                    
-                    # Add limited row data (preview only for async results)
-                    if table.rows:
-                        preview_size = min(config.large_file.max_response_rows, len(table.rows))
-                        table_dict['rows_preview'] = table.rows[:preview_size]
-                        table_dict['preview_truncated'] = len(table.rows) > preview_size
-                        table_dict['total_rows_available'] = len(table.rows)
-                    
-                    limited_tables.append(table_dict)
-                
-                task_result['tables'] = limited_tables
-            
-            # Apply additional size limits
-            limited_result = _apply_size_limits_to_task_result(task_result)
             
-            update_task_status(task_id, {
-                "status": TaskStatus.COMPLETED,
-                "result": limited_result
+        except Exception as e:
+            logger.error(f"Background processing failed: {e}")
+            await update_task_status(task_id, {
+                "status": TaskStatus.FAILED,
+                "error": str(e)
             })
-        
-    except Exception as e:
-        logger.error(f"Background processing failed: {e}")
-        update_task_status(task_id, {
-            "status": TaskStatus.FAILED,
-            "error": str(e)
-        })
 
 # API Endpoints
 @app.post("/extract/")
 async def extract_sync(file: UploadFile = File(...), db: Session = Depends(get_db)):
     """Process document synchronously with performance tracking and CSV table handling."""
-    import time
     start_time = time.time()
     
-    content = await file.read()
+    document = await _read_upload(file)
+    content = document.content
     
     # Check if this is a tabular file and handle as table
-    if _is_tabular_file(file.filename, content):
-        return await _process_tabular_as_table(file, content, start_time, db)
+    if _is_tabular_file(file.filename):
+        return await _process_tabular_as_table(file, content, start_time, db, file_hash=document.file_hash)
     
-    # Regular document processing
-    document = Document(content=content, filename=file.filename)
-    
-    service = get_extraction_service(db)
-    
-    # Get the action info by checking if document exists first
-    import hashlib
-    from src.adapters.database.models import DocumentRecord
-    
-    file_hash = hashlib.sha256(content).hexdigest()
-    existing = db.query(DocumentRecord).filter(DocumentRecord.file_hash == file_hash).first()
+    # Get the action info by checking if document exists first (blocking query, run off the event loop)
+    existing = await asyncio.to_thread(_find_document_by_hash, db, document.file_hash, len(content), content)
     action = "updated" if existing else "created"
     
-    # Process the document
-    result = service.extract_from_document(document)
+    # Regular document processing, off the event loop
+    loop = asyncio.get_running_loop()
+    result = await loop.run_in_executor(_get_extraction_pool(), _extract_in_worker, document)
     
     # Calculate processing time
     processing_time = round((time.time() - start_time) * 1000)  # milliseconds
     
+    max_rows = config.large_file.max_response_rows
+    
     # Convert tables to serializable format with size limits for ALL document types
     tables_data = []
     if result.tables:
@@ -435,50 +664,42 @@ async def extract_sync(file: UploadFile = File(...), db: Session = Depends(get_d
             limited_rows = table.rows
             response_truncated = False
             
-            if table.rows and len(table.rows) > config.large_file.max_response_rows:
-                limited_rows = table.rows[:config.large_file.max_response_rows]
+            if table.rows and len(table.rows) > max_rows:
+                limited_rows = table.rows[:max_rows]
                 response_truncated = True
-                logger.info(f"Sync response truncated: showing {config.large_file.max_response_rows} of {len(table.rows)} rows for table {table.table_index}")
+                logger.info(f"Sync response truncated: showing {max_rows} of {len(table.rows)} rows for table {table.table_index}")
             
             # Create semantic data format from headers and limited rows
             data_records = []
             if table.headers and limited_rows:
-                for row in limited_rows:
-                    if len(row) == len(table.headers):
-                        record = {header: (value if value is not None else None) for header, value in zip(table.headers, row)}
-                        data_records.append(record)
+                headers = table.headers
+                column_count = len(headers)
+                data_records = [dict(zip(headers, row)) for row in limited_rows if len(row) == column_count]
             
-            table_dict = {
-                "table_index": table.table_index,
-                "page_number": table.page_number,
-                "title": table.title,
-                "context_before": table.context_before,
-                "context_after": table.context_after,
-                "section_heading": table.section_heading,
-                "headers": table.headers,  # Include headers for compatibility
+            table_dict = _serialize_table(table, _TABLE_SUMMARY_FIELDS, _TABLE_CONTEXT_FIELDS)
+            is_truncated, truncation_reason, original_row_count, stored_row_count = \
+                _table_field_getter(_TABLE_STORAGE_FIELDS)(table)
+            table_dict.update({
                 "data": data_records,  # Key-value format with size limits
-                "row_count": table.row_count,
-                "column_count": table.column_count,
-                "table_type": table.table_type,
-                "confidence_score": table.confidence_score,
-                "extraction_method": table.extraction_method,
                 # Add response truncation metadata
                 "response_truncated": response_truncated,
                 "response_sample_size": len(data_records),
                 "total_rows_available": table.row_count,
                 # Include storage truncation info if available
-                "storage_truncated": getattr(table, 'is_truncated', False),
-                "storage_truncation_reason": getattr(table, 'truncation_reason', None),
-                "original_row_count": getattr(table, 'original_row_count', table.row_count),
-                "stored_row_count": getattr(table, 'stored_row_count', table.row_count)
-            }
+                "storage_truncated": is_truncated,
+                "storage_truncation_reason": truncation_reason,
+                "original_row_count": original_row_count,
+                "stored_row_count": stored_row_count
+            })
             tables_data.append(table_dict)
     
     # Add action information to response
     response_data = {
         "id": result.id,
         "filename": result.filename,
-        "full_text": result.full_text,
+        # Full text can be megabytes; return a preview and let clients fetch the rest on demand
+        "text_preview": result.full_text[:200] + "..." if len(result.full_text) > 200 else result.full_text,
+        "text_url": f"/documents/{result.id}/text",
         "page_count": result.page_count,
         "has_ocr_content": result.has_ocr_content,
         "processing_method": result.processing_method,
@@ -489,142 +710,238 @@ async def extract_sync(file: UploadFile = File(...), db: Session = Depends(get_d
         "file_size_bytes": len(content)
     }
     
-    return response_data
+    return FastJSONResponse(response_data)
 
 @app.post("/extract/async/")
 async def extract_async(
     background_tasks: BackgroundTasks,
-    file: UploadFile = File(...),
-    db: Session = Depends(get_db)
+    file: UploadFile = File(...)
 ):
-    """Process document asynchronously."""
-    content = await file.read()
-    document = Document(content=content, filename=file.filename)
+    """
+    Process document asynchronously.
+    With Celery, small uploads travel inline in the task; larger ones are written to
+    shared storage and the task only carries their path.
+    """
     task_id = str(uuid.uuid4())
     
+    # The upload is read before the task status exists, so a failed read leaves no
+    # task pending forever
+    if USE_CELERY:
+        task_data = await _build_task_payload(file)
+    else:
+        document = await _read_upload(file)
+    
     # Store initial task status
-    store_task_status(task_id, {
-        "task_id": task_id,
-        "status": TaskStatus.PENDING,
-        "filename": file.filename,
-        "created_at": datetime.now().isoformat()
-    })
+    await store_task_status(task_id, _initial_task_status(task_id, file.filename))
     
     if USE_CELERY:
-        # Use Celery for production
-        import base64
-        task_data = {
-            'content': base64.b64encode(content).decode('utf-8'),
-            'filename': file.filename
-        }
-        celery_task = process_document_task.delay(task_data)
-        update_task_status(task_id, {"celery_task_id": celery_task.id})
+        # Use Celery for production; the Celery task reuses our task id
+        try:
+            process_document_task.apply_async(args=[task_data], task_id=task_id, queue=_task_queue(file.filename))
+        except Exception as e:
+            _discard_task_payloads([task_data])
+            await _fail_unqueued_tasks([task_id], e)
+            raise
     else:
         # Use BackgroundTasks for development
-        background_tasks.add_task(process_document_background, task_id, document, db)
+        background_tasks.add_task(process_document_background, task_id, document)
     
-    return {
+    return FastJSONResponse({
         "task_id": task_id,
         "status": "pending"
-    }
+    })
+
+@app.post("/extract/batch/")
+async def extract_batch(
+    background_tasks: BackgroundTasks,
+    files: List[UploadFile] = File(...)
+):
+    """
+    Process many documents asynchronously.
+    With Celery, payloads are built as in /extract/async/ (inline when small, a
+    shared storage reference otherwise) and enqueued together as one group.
+    """
+    tasks = []
+    task_refs = []
+    initial_statuses = {}
+    
+    try:
+        for file in files:
+            task_id = str(uuid.uuid4())
+            initial_statuses[task_id] = _initial_task_status(task_id, file.filename)
+            tasks.append({"task_id": task_id, "filename": file.filename, "status": "pending"})
+            
+            if USE_CELERY:
+                task_refs.append(await _build_task_payload(file))
+            else:
+                # Use BackgroundTasks for development
+                document = await _read_upload(file)
+                background_tasks.add_task(process_document_background, task_id, document)
+        
+        # All initial statuses are written together, before any task is enqueued
+        await store_task_statuses(initial_statuses)
+    except Exception:
+        # Nothing was enqueued, so no worker will remove the stored uploads
+        _discard_task_payloads(task_refs)
+        raise
+    
+    if USE_CELERY and task_refs:
+        # A group is published in one broker round-trip instead of one per file
+        from celery import group
+        try:
+            group(
+                process_document_task.s(ref).set(task_id=task["task_id"], queue=_task_queue(task["filename"]))
+                for task, ref in zip(tasks, task_refs)
+            ).apply_async()
+        except Exception as e:
+            _discard_task_payloads(task_refs)
+            await _fail_unqueued_tasks(initial_statuses, e)
+            raise
+    
+    return FastJSONResponse({
+        "task_count": len(tasks),
+        "tasks": tasks
+    })
 
 @app.get("/extract/status/{task_id}")
 async def get_status(task_id: str):
     """Get task status with size-limited results to prevent browser crashes."""
-    status = get_task_status(task_id)
+    if USE_CELERY:
+        # Celery tasks share our task id, so status and Celery result are fetched concurrently
+        fields, celery_meta = await asyncio.gather(
+            redis_client.hgetall(f"task:{task_id}"),
+            _get_celery_task_meta(task_id)
+        )
+        if fields and orjson.loads(fields.get(b'status', b'null')) in (TaskStatus.COMPLETED, TaskStatus.FAILED):
+            # Results are size-limited before they are stored, so a resolved task's stored
+            # fields are sent as they are instead of being decoded and re-encoded
+            return Response(content=_task_fields_to_json(fields), media_type="application/json")
+        status = _decode_task_fields(fields)
+    else:
+        status, celery_meta = await get_task_status(task_id), None
+    
     if not status:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    # Check Celery status if using Celery
-    if USE_CELERY and 'celery_task_id' in status:
-        celery_task = celery_app.AsyncResult(status['celery_task_id'])
-        if celery_task.state == 'SUCCESS':
+    # Check Celery status if the task hasn't been resolved yet
+    if celery_meta and status.get('status') not in (TaskStatus.COMPLETED, TaskStatus.FAILED):
+        if celery_meta['status'] == 'SUCCESS':
             # Apply size limits to Celery result before storing
-            celery_result = celery_task.result
+            celery_result = celery_meta['result']
             if isinstance(celery_result, dict):
                 celery_result = _apply_size_limits_to_task_result(celery_result)
             
-            update_task_status(task_id, {
+            updates = {
                 "status": TaskStatus.COMPLETED,
                 "result": celery_result
-            })
-            status = get_task_status(task_id)
-        elif celery_task.state == 'FAILURE':
-            update_task_status(task_id, {
+            }
+            await update_task_status(task_id, updates)
+            status.update(updates)
+        elif celery_meta['status'] == 'FAILURE':
+            updates = {
                 "status": TaskStatus.FAILED,
-                "error": str(celery_task.info)
-            })
-            status = get_task_status(task_id)
+                "error": str(celery_meta['result'])
+            }
+            await update_task_status(task_id, updates)
+            status.update(updates)
     
     # Apply size limits to the result before returning (for both Celery and BackgroundTasks)
     if status and status.get('result'):
         status['result'] = _apply_size_limits_to_task_result(status['result'])
     
-    return status
+    return FastJSONResponse(status)
 
 @app.get("/documents/{document_id}")
-async def get_document(document_id: int, db: Session = Depends(get_db)):
+async def get_document(document_id: int, service: IExtractionService = Depends(extraction_service_dep)):
     """Get document by ID with limited table data to prevent browser crashes."""
-    service = get_extraction_service(db)
     document = service.get_document_by_id(document_id)
     if not document:
         raise HTTPException(status_code=404, detail="Document not found")
     
-    # Convert to dict and limit table data for response
-    doc_dict = document.dict()
-    
-    # Limit table data to prevent browser crashes (applies to all document types)
-    if doc_dict.get('tables'):
-        limited_tables = []
-        for table in doc_dict['tables']:
-            # Limit rows to prevent browser crashes for ALL document types
-            if table.get('rows') and len(table['rows']) > config.large_file.max_response_rows:
-                original_rows = len(table['rows'])
-                table['rows'] = table['rows'][:config.large_file.max_response_rows]
-                table['response_truncated'] = True
-                table['response_sample_size'] = config.large_file.max_response_rows
-                table['total_rows_available'] = table.get('original_row_count', original_rows)
-                logger.info(f"API response truncated: showing {config.large_file.max_response_rows} of {original_rows} rows for table {table.get('table_index', 'unknown')}")
-            else:
-                table['response_truncated'] = False
-                table['response_sample_size'] = len(table.get('rows', []))
-            
-            # Include storage truncation info if available
-            if table.get('is_truncated'):
-                table['storage_truncated'] = True
-                table['storage_truncation_reason'] = table.get('truncation_reason')
-            else:
-                table['storage_truncated'] = False
-                
-            limited_tables.append(table)
-        doc_dict['tables'] = limited_tables
+    # Tables are converted, limited and serialized one at a time while the response streams
+    max_rows = config.large_file.max_response_rows
+    tables = (_limit_document_table(table.dict(), max_rows) for table in document.tables)
+    return StreamingResponse(
+        _iter_json_object(document.dict(exclude={"tables"}), "tables", tables),
+        media_type="application/json"
+    )
+
+def _limit_document_table(table: dict, max_rows: int) -> dict:
+    """Limit rows of a stored table to prevent browser crashes and add truncation metadata."""
+    # Limit rows to prevent browser crashes for ALL document types
+    if table.get('rows') and len(table['rows']) > max_rows:
+        original_rows = len(table['rows'])
+        table['rows'] = table['rows'][:max_rows]
+        table['response_truncated'] = True
+        table['response_sample_size'] = max_rows
+        table['total_rows_available'] = table.get('original_row_count', original_rows)
+        logger.info(f"API response truncated: showing {max_rows} of {original_rows} rows for table {table.get('table_index', 'unknown')}")
+    else:
+        table['response_truncated'] = False
+        table['response_sample_size'] = len(table.get('rows', []))
+    
+    # Include storage truncation info if available
+    if table.get('is_truncated'):
+        table['storage_truncated'] = True
+        table['storage_truncation_reason'] = table.get('truncation_reason')
+    else:
+        table['storage_truncated'] = False
+    
+    return table
+
+def _iter_json_object(fields: dict, list_key: str, items: Iterable) -> Iterator[bytes]:
+    """
+    Serialize {**fields, list_key: [*items]} as JSON incrementally.
+    Each list item is serialized on its own, so the full document is never held as one buffer.
+    """
+    yield dump_json(fields)[:-1]
+    yield (b',' if fields else b'') + dump_json(list_key) + b':['
+    for index, item in enumerate(items):
+        if index:
+            yield b','
+        yield dump_json(item)
+    yield b']}'
+
+# Characters per chunk when streaming document text
+TEXT_STREAM_CHUNK_SIZE = 64 * 1024
+
+@app.get("/documents/{document_id}/text")
+async def get_document_text(document_id: int, db: Session = Depends(get_db)):
+    """Stream the full extracted text of a document."""
+    # Load only the text column, not the tables JSON
+    row = db.query(DocumentRecord.full_text).filter(DocumentRecord.id == document_id).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Document not found")
+    
+    full_text = row.full_text or ""
+    
+    def iter_text():
+        for start in range(0, len(full_text), TEXT_STREAM_CHUNK_SIZE):
+            yield full_text[start:start + TEXT_STREAM_CHUNK_SIZE]
     
-    return doc_dict
+    return StreamingResponse(iter_text(), media_type="text/plain; charset=utf-8")
 
-@app.get("/documents/", response_model=List[ExtractedData])
+@app.get("/documents/", response_model=List[DocumentSummary])
 async def get_documents(
     limit: int = Query(100, ge=1, le=1000),
     offset: int = Query(0, ge=0),
-    db: Session = Depends(get_db)
+    service: IExtractionService = Depends(extraction_service_dep)
 ):
     """Get all documents."""
-    service = get_extraction_service(db)
     return service.get_all_documents(limit=limit, offset=offset)
 
-@app.get("/search/", response_model=List[ExtractedData])
+@app.get("/search/", response_model=List[DocumentSummary])
 async def search_documents(
     q: str = Query(..., min_length=1),
     limit: int = Query(100, ge=1, le=1000),
-    db: Session = Depends(get_db)
+    service: IExtractionService = Depends(extraction_service_dep)
 ):
     """Search documents."""
-    service = get_extraction_service(db)
     return service.search_documents(search_term=q, limit=limit)
 
 @app.get("/documents/{document_id}/tables")
-async def get_document_tables(document_id: int, db: Session = Depends(get_db)):
+async def get_document_tables(document_id: int, service: IExtractionService = Depends(extraction_service_dep)):
     """Get all tables from a specific document."""
-    service = get_extraction_service(db)
     document = service.get_document_by_id(document_id)
     if not document:
         raise HTTPException(status_code=404, detail="Document not found")
@@ -632,28 +949,191 @@ async def get_document_tables(document_id: int, db: Session = Depends(get_db)):
     # Enhance response with contextual information
     tables_with_context = []
     for table in document.tables:
-        table_info = {
-            "table_index": table.table_index,
-            "page_number": table.page_number,
-            "title": table.title,
-            "context_before": table.context_before,
-            "context_after": table.context_after,
-            "section_heading": table.section_heading,
-            "table_type": table.table_type,
-            "confidence_score": table.confidence_score,
-            "headers": table.headers,
-            "row_count": table.row_count,
-            "column_count": table.column_count,
-            "rows": table.rows[:5] if table.rows else [],  # Show first 5 rows as preview
-            "total_rows": len(table.rows) if table.rows else 0
-        }
+        table_info = _serialize_table(table, _TABLE_SUMMARY_FIELDS, _TABLE_CONTEXT_FIELDS)
+        table_info["rows"] = table.rows[:5] if table.rows else []  # Show first 5 rows as preview
+        table_info["total_rows"] = len(table.rows) if table.rows else 0
         tables_with_context.append(table_info)
     
-    return {
+    return FastJSONResponse({
         "document_id": document_id,
         "filename": document.filename,
         "table_count": document.table_count,
         "tables": tables_with_context
+    })
+
+def _fetch_document_table(db: Session, document_id: int, table_index: int) -> Optional[dict]:
+    """
+    Load a single table of a document by its table_index.
+    The table is selected inside Postgres, so only that element of tables_data is returned
+    instead of hydrating the whole JSONB column. table_index normally equals the array
+    position, so that element is tried first; the array is only scanned when empty
+    tables were skipped during extraction and the positions shifted.
+    """
+    row = db.execute(text("""
+        SELECT COALESCE(
+            CASE
+                WHEN (d.tables_data -> :table_index ->> 'table_index')::int = :table_index
+                THEN d.tables_data -> :table_index
+            END,
+            (
+                SELECT t.value
+                FROM jsonb_array_elements(d.tables_data) t
+                WHERE (t.value->>'table_index')::int = :table_index
+                LIMIT 1
+            )
+        ) AS table_data
+        FROM documents d
+        WHERE d.id = :document_id
+        AND d.tables_data IS NOT NULL
+        AND jsonb_typeof(d.tables_data) = 'array'
+    """), {"document_id": document_id, "table_index": table_index}).first()
+    
+    return row.table_data if row else None
+
+# One page of a table's header/row 'rows' (t is the table element of tables_data).
+# Rows that don't match the header count can't be converted to records, so they are
+# skipped and not counted; tables without headers keep all their rows.
+_TABLE_ROWS_PAGE_JOIN = """
+    LEFT JOIN LATERAL (
+        SELECT
+            COUNT(*) AS rows_stored,
+            COUNT(*) FILTER (WHERE r.valid) AS rows_total,
+            json_agg(r.value ORDER BY r.position) FILTER (
+                WHERE r.valid AND r.position > :offset AND r.position <= :offset + :limit
+            ) AS rows_page
+        FROM (
+            SELECT
+                e.value,
+                e.valid,
+                row_number() OVER (PARTITION BY e.valid ORDER BY e.ordinality) AS position
+            FROM (
+                SELECT
+                    el.value,
+                    el.ordinality,
+                    CASE
+                        WHEN h.header_count = 0 THEN true
+                        WHEN jsonb_typeof(el.value) = 'array' THEN jsonb_array_length(el.value) = h.header_count
+                        ELSE false
+                    END AS valid
+                FROM (
+                    SELECT jsonb_array_length(
+                        CASE WHEN jsonb_typeof(t.value->'headers') = 'array' THEN t.value->'headers' ELSE '[]'::jsonb END
+                    ) AS header_count
+                ) h
+                CROSS JOIN jsonb_array_elements(
+                    CASE WHEN jsonb_typeof(t.value->'rows') = 'array' THEN t.value->'rows' ELSE '[]'::jsonb END
+                ) WITH ORDINALITY el
+            ) e
+        ) r
+    ) table_rows ON true
+"""
+
+def _fetch_document_table_page(db: Session, document_id: int, table_index: int, offset: int, limit: int) -> Optional[tuple]:
+    """
+    Load a single table with only one page of its key-value 'data' records and of its
+    header/row 'rows'.
+    Data pages come from the normalized document_table_rows (an indexed range scan);
+    documents stored before rows were normalized are sliced inside Postgres instead.
+    Rows are always sliced inside Postgres. Either way the full record and row lists
+    never leave the database.
+    
+    Returns:
+        tuple: (table without 'data' and 'rows', page of data records, total data record count,
+            page of convertible rows, total convertible row count, total stored row count),
+            or None if not found
+    """
+    table_rows = db.query(DocumentTableRow).filter(
+        DocumentTableRow.document_id == document_id,
+        DocumentTableRow.table_index == table_index
+    )
+    stored_total = table_rows.with_entities(func.count()).scalar()
+    
+    if stored_total:
+        row = db.execute(text("""
+            SELECT
+                t.value - 'data' - 'rows' AS table_meta,
+                table_rows.rows_page, table_rows.rows_total, table_rows.rows_stored
+            FROM documents d
+            CROSS JOIN LATERAL jsonb_array_elements(d.tables_data) t
+        """ + _TABLE_ROWS_PAGE_JOIN + """
+            WHERE d.id = :document_id
+            AND d.tables_data IS NOT NULL
+            AND jsonb_typeof(d.tables_data) = 'array'
+            AND (t.value->>'table_index')::int = :table_index
+            LIMIT 1
+        """), {"document_id": document_id, "table_index": table_index, "offset": offset, "limit": limit}).first()
+        if not row:
+            return None
+        
+        data_page = [
+            record for record, in table_rows.with_entities(DocumentTableRow.row_data)
+            .order_by(DocumentTableRow.row_index)
+            .offset(offset)
+            .limit(limit)
+        ]
+        return row.table_meta, data_page, stored_total, row.rows_page or [], row.rows_total, row.rows_stored
+    
+    row = db.execute(text("""
+        SELECT
+            t.value - 'data' - 'rows' AS table_meta,
+            CASE WHEN jsonb_typeof(t.value->'data') = 'array'
+                 THEN jsonb_array_length(t.value->'data') ELSE 0 END AS data_total,
+            CASE WHEN jsonb_typeof(t.value->'data') = 'array' THEN (
+                SELECT json_agg(e.value ORDER BY e.ordinality)
+                FROM jsonb_array_elements(t.value->'data') WITH ORDINALITY e
+                WHERE e.ordinality > :offset AND e.ordinality <= :offset + :limit
+            ) END AS data_page,
+            table_rows.rows_page, table_rows.rows_total, table_rows.rows_stored
+        FROM documents d
+        CROSS JOIN LATERAL jsonb_array_elements(d.tables_data) t
+    """ + _TABLE_ROWS_PAGE_JOIN + """
+        WHERE d.id = :document_id
+        AND d.tables_data IS NOT NULL
+        AND jsonb_typeof(d.tables_data) = 'array'
+        AND (t.value->>'table_index')::int = :table_index
+        LIMIT 1
+    """), {"document_id": document_id, "table_index": table_index, "offset": offset, "limit": limit}).first()
+    
+    if not row:
+        return None
+    return row.table_meta, row.data_page or [], row.data_total, row.rows_page or [], row.rows_total, row.rows_stored
+
+def _select_table_page_data(table_page: tuple) -> tuple[list, int, str]:
+    """
+    Pick the page of records to return for a table: its key-value 'data' records if it
+    has any, otherwise its header/row 'rows' converted to records (or as raw rows
+    when the table has no headers).
+    
+    Returns:
+        tuple: (page of records or rows, total row count, data format)
+    """
+    table_data, data_page, data_total, rows_page, rows_total, rows_stored = table_page
+    
+    # Use data field if available (for CSV files and new format), otherwise use rows (for PDF/DOCX/HTML)
+    if data_total > 0:
+        return data_page, data_total, "key_value"  # Modern format
+    if rows_stored > 0:
+        # Convert rows to key-value format for consistency across all document types
+        headers = table_data.get("headers") or []
+        if headers:
+            return [dict(zip(headers, row)) for row in rows_page], rows_total, "converted_rows"
+        # Fallback to raw rows if no headers
+        return rows_page, rows_total, "raw_rows"
+    return [], 0, "empty"
+
+@functools.lru_cache(maxsize=4096)
+def _build_pagination(page: int, page_size: int, total_rows: int) -> dict:
+    """
+    Build the pagination metadata of a table page.
+    Cached per (page, page_size, total_rows); the returned dict is shared, so callers must not modify it.
+    """
+    return {
+        "page": page,
+        "page_size": page_size,
+        "total_rows": total_rows,
+        "total_pages": (total_rows + page_size - 1) // page_size if total_rows > 0 else 0,
+        "has_next": page * page_size < total_rows,
+        "has_prev": page > 1
     }
 
 @app.get("/documents/{document_id}/tables/{table_index}")
@@ -666,208 +1146,180 @@ async def get_document_table(
     db: Session = Depends(get_db)
 ):
     """Get a specific table from a document with pagination to prevent browser crashes."""
-    from src.adapters.database.models import DocumentRecord
-    
-    # Get document with tables
-    document = db.query(DocumentRecord).filter(DocumentRecord.id == document_id).first()
-    if not document or not document.tables_data:
+    # Only the requested page of key-value records and rows is loaded from the database
+    table_page = _fetch_document_table_page(db, document_id, table_index, (page - 1) * page_size, page_size)
+    if not table_page:
         raise HTTPException(status_code=404, detail="Document or table not found")
-    
-    # Find the specific table
-    table_data = None
-    for table in document.tables_data:
-        if table.get("table_index") == table_index:
-            table_data = table
-            break
-    
-    if not table_data:
-        raise HTTPException(status_code=404, detail="Table not found")
-    
-    # Apply pagination to prevent browser crashes
-    def paginate_data(data_list, page_num, size):
-        if not data_list:
-            return []
-        start_idx = (page_num - 1) * size
-        end_idx = start_idx + size
-        return data_list[start_idx:end_idx]
+    table_data = table_page[0]
     
     if format == "html":
-        return {"table_html": table_data.get("table_html")}
+        return FastJSONResponse({"table_html": table_data.get("table_html")})
     elif format == "markdown":
-        return {"table_markdown": table_data.get("table_markdown")}
-    elif format == "context":
-        # For context, limit the data to prevent crashes (works for all document types)
-        rows = table_data.get("rows", [])
-        data = table_data.get("data", [])
-        
-        # Use data field if available (for CSV files and new format), otherwise use rows (for PDF/DOCX/HTML)
-        if data and len(data) > 0:
-            paginated_data = paginate_data(data, page, page_size)
-            total_rows = len(data)
-            data_format = "key_value"  # Modern format
-        elif rows and len(rows) > 0:
-            # Convert rows to key-value format for consistency across all document types
-            headers = table_data.get("headers", [])
-            if headers:
-                rows_as_records = []
-                for row in rows:
-                    if len(row) == len(headers):
-                        record = {header: (value if value is not None else None) for header, value in zip(headers, row)}
-                        rows_as_records.append(record)
-                paginated_data = paginate_data(rows_as_records, page, page_size)
-                total_rows = len(rows_as_records)
-                data_format = "converted_rows"
-            else:
-                # Fallback to raw rows if no headers
-                paginated_data = paginate_data(rows, page, page_size)
-                total_rows = len(rows)
-                data_format = "raw_rows"
-        else:
-            paginated_data = []
-            total_rows = 0
-            data_format = "empty"
-        
-        return {
-            "table_index": table_data.get("table_index"),
-            "page_number": table_data.get("page_number"),
+        return FastJSONResponse({"table_markdown": table_data.get("table_markdown")})
+    else:
+        # Both context and basic JSON are paginated (works for all document types)
+        return FastJSONResponse(
+            _build_table_payload(table_page, page, page_size, include_context=(format == "context"))
+        )
+
+def _build_table_payload(table_page: tuple, page: int, page_size: int, include_context: bool) -> dict:
+    """
+    Build the paginated JSON payload of a table.
+    include_context adds the title, surrounding context and classification fields
+    (format=context) in front of the table's headers and data.
+    """
+    table_data = table_page[0]
+    paginated_data, total_rows, data_format = _select_table_page_data(table_page)
+    
+    payload = {
+        "table_index": table_data.get("table_index"),
+        "page_number": table_data.get("page_number"),
+    }
+    if include_context:
+        payload.update({
             "title": table_data.get("title"),
             "context_before": table_data.get("context_before"),
             "context_after": table_data.get("context_after"),
             "section_heading": table_data.get("section_heading"),
             "table_type": table_data.get("table_type"),
             "confidence_score": table_data.get("confidence_score"),
-            "headers": table_data.get("headers"),
-            "data": paginated_data,  # Use paginated data
-            "row_count": table_data.get("row_count"),
-            "column_count": table_data.get("column_count"),
-            "pagination": {
-                "page": page,
-                "page_size": page_size,
-                "total_rows": total_rows,
-                "total_pages": (total_rows + page_size - 1) // page_size if total_rows > 0 else 0,
-                "has_next": page * page_size < total_rows,
-                "has_prev": page > 1
-            },
-            "data_format": data_format,
-            "supports_all_document_types": True,  # Works for PDF, DOCX, HTML, CSV, etc.
-            "truncation_info": {
-                "storage_truncated": table_data.get("is_truncated", False),
-                "storage_reason": table_data.get("truncation_reason"),
-                "original_row_count": table_data.get("original_row_count"),
-                "stored_row_count": table_data.get("stored_row_count")
-            }
-        }
-    else:  # json (basic)
-        # For basic JSON, also apply pagination (works for all document types)
-        rows = table_data.get("rows", [])
-        data = table_data.get("data", [])
-        
-        # Use data field if available (for CSV files and new format), otherwise use rows (for PDF/DOCX/HTML)
-        if data and len(data) > 0:
-            paginated_data = paginate_data(data, page, page_size)
-            total_rows = len(data)
-            data_format = "key_value"  # Modern format
-        elif rows and len(rows) > 0:
-            # Convert rows to key-value format for consistency across all document types
-            headers = table_data.get("headers", [])
-            if headers:
-                rows_as_records = []
-                for row in rows:
-                    if len(row) == len(headers):
-                        record = {header: (value if value is not None else None) for header, value in zip(headers, row)}
-                        rows_as_records.append(record)
-                paginated_data = paginate_data(rows_as_records, page, page_size)
-                total_rows = len(rows_as_records)
-                data_format = "converted_rows"
-            else:
-                # Fallback to raw rows if no headers
-                paginated_data = paginate_data(rows, page, page_size)
-                total_rows = len(rows)
-                data_format = "raw_rows"
-        else:
-            paginated_data = []
-            total_rows = 0
-            data_format = "empty"
-        
-        return {
-            "table_index": table_data.get("table_index"),
-            "page_number": table_data.get("page_number"),
-            "headers": table_data.get("headers"),
-            "data": paginated_data,  # Use paginated data instead of full rows
-            "row_count": table_data.get("row_count"),
-            "column_count": table_data.get("column_count"),
-            "pagination": {
-                "page": page,
-                "page_size": page_size,
-                "total_rows": total_rows,
-                "total_pages": (total_rows + page_size - 1) // page_size if total_rows > 0 else 0,
-                "has_next": page * page_size < total_rows,
-                "has_prev": page > 1
-            },
-            "data_format": data_format,
-            "supports_all_document_types": True,  # Works for PDF, DOCX, HTML, CSV, etc.
-            "truncation_info": {
-                "storage_truncated": table_data.get("is_truncated", False),
-                "storage_reason": table_data.get("truncation_reason"),
-                "original_row_count": table_data.get("original_row_count"),
-                "stored_row_count": table_data.get("stored_row_count")
-            }
+        })
+    payload.update({
+        "headers": table_data.get("headers"),
+        "data": paginated_data,  # Use paginated data instead of full rows
+        "row_count": table_data.get("row_count"),
+        "column_count": table_data.get("column_count"),
+        "pagination": _build_pagination(page, page_size, total_rows),
+        "data_format": data_format,
+        "supports_all_document_types": True,  # Works for PDF, DOCX, HTML, CSV, etc.
+        "truncation_info": {
+            "storage_truncated": table_data.get("is_truncated", False),
+            "storage_reason": table_data.get("truncation_reason"),
+            "original_row_count": table_data.get("original_row_count"),
+            "stored_row_count": table_data.get("stored_row_count")
         }
+    })
+    return payload
 
 @app.get("/tables/search")
 async def search_tables(
     q: str = Query(..., min_length=1),
     limit: int = Query(100, ge=1, le=1000),
+    mode: str = Query("substring", regex="^(substring|fulltext)$"),
     db: Session = Depends(get_db)
 ):
-    """Search within table content using PostgreSQL JSON queries."""
-    from src.adapters.database.models import DocumentRecord
-    from sqlalchemy import text
+    """
+    Search within table content using PostgreSQL JSON queries.
+    mode=substring matches any substring (ILIKE); mode=fulltext matches words of the
+    table's string values (web search syntax) and orders results by relevance.
+    """
+    # Match individual tables inside Postgres so only matching tables (and only the
+    # fields we return) leave the database. The document-level predicate prunes rows
+    # with an index before their JSON is unrolled: ix_documents_tables_text_trgm for
+    # substring search, ix_documents_tables_fts for full-text search.
+    if mode == "fulltext":
+        document_filter = """jsonb_to_tsvector('english', d.tables_data, '["string"]') @@ websearch_to_tsquery('english', :q)"""
+        table_filter = """jsonb_to_tsvector('english', t.value, '["string"]') @@ websearch_to_tsquery('english', :q)"""
+        order_by = """ORDER BY ts_rank_cd(jsonb_to_tsvector('english', t.value, '["string"]'), websearch_to_tsquery('english', :q)) DESC"""
+    else:
+        document_filter = "d.tables_data::text ILIKE :search_term"
+        table_filter = "t.value::text ILIKE :search_term"
+        order_by = ""
     
-    # Search in tables_data JSON using PostgreSQL JSON operators
-    query = text("""
-        SELECT d.id, d.filename, d.tables_data, d.table_count
-        FROM documents d
+    query = text(f"""
+        SELECT 
+            d.id AS document_id,
+            d.filename,
+            (t.value->>'table_index')::int AS table_index,
+            (t.value->>'page_number')::int AS page_number,
+            t.value->'headers' AS headers,
+            (t.value->>'row_count')::int AS row_count,
+            (t.value->>'column_count')::int AS column_count,
+            CASE 
+                WHEN length(t.value->>'table_text') > 200 THEN left(t.value->>'table_text', 200) || '...'
+                ELSE coalesce(t.value->>'table_text', '')
+            END AS table_text
+        FROM documents d, LATERAL jsonb_array_elements(d.tables_data) t
         WHERE d.tables_data IS NOT NULL 
-        AND d.tables_data::text ILIKE :search_term
+        AND jsonb_typeof(d.tables_data) = 'array'
+        AND {document_filter}
+        AND {table_filter}
+        {order_by}
         LIMIT :limit
     """)
     
     results = db.execute(query, {
+        "q": q,
         "search_term": f"%{q}%",
         "limit": limit
-    }).fetchall()
-    
-    # Process results to extract matching tables
-    table_results = []
-    for row in results:
-        if row.tables_data:
-            for table in row.tables_data:
-                # Check if this table contains the search term
-                table_text = table.get("table_text", "")
-                if q.lower() in table_text.lower():
-                    table_results.append({
-                        "document_id": row.id,
-                        "filename": row.filename,
-                        "table_index": table.get("table_index"),
-                        "page_number": table.get("page_number"),
-                        "headers": table.get("headers"),
-                        "row_count": table.get("row_count"),
-                        "column_count": table.get("column_count"),
-                        "table_text": table_text[:200] + "..." if len(table_text) > 200 else table_text
-                    })
+    }).mappings().all()
     
-    return {
+    return FastJSONResponse({
         "query": q,
-        "total_results": len(table_results),
-        "tables": table_results[:limit]
-    }
-
-
+        "total_results": len(results),
+        "tables": [dict(row) for row in results]
+    })
 
+EXPORT_CHUNK_SIZE = 64 * 1024  # Approximate size of each chunk of a streamed table export
 
+def _table_headers_and_rows(table_data: dict) -> tuple[List[str], Iterable[list]]:
+    """Get headers and row values of a stored table, whether it holds 'rows' or key-value 'data'."""
+    headers = table_data.get("headers") or []
+    rows = table_data.get("rows")
+    if rows:
+        return headers, rows
+    
+    data = table_data.get("data") or []
+    if not headers and data:
+        headers = list(data[0].keys())
+    return headers, ([record.get(header) for header in headers] for record in data)
 
+def _iter_csv_export(table_data: dict) -> Iterator[str]:
+    """
+    Yield the CSV export of a table in chunks of about EXPORT_CHUNK_SIZE characters.
+    A stored table_csv is sent as-is; otherwise the CSV is written from the table's rows.
+    """
+    table_csv = table_data.get("table_csv")
+    if table_csv:
+        for start in range(0, len(table_csv), EXPORT_CHUNK_SIZE):
+            yield table_csv[start:start + EXPORT_CHUNK_SIZE]
+        return
+    
+    headers, rows = _table_headers_and_rows(table_data)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    if headers:
+        writer.writerow(headers)
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= EXPORT_CHUNK_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
 
+def _iter_excel_export(headers: List[str], rows: Iterable[list]) -> Iterator[bytes]:
+    """
+    Build an .xlsx file for a table and yield it in chunks.
+    Uses openpyxl's write-only mode, which streams rows to the file instead of
+    building the full worksheet object tree in memory, and spools the finished
+    file to disk rather than holding it in memory while it is sent.
+    """
+    from openpyxl import Workbook
+    
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet()
+    if headers:
+        worksheet.append(headers)
+    for row in rows:
+        worksheet.append(row)
+    
+    with tempfile.TemporaryFile() as spool:
+        workbook.save(spool)
+        spool.seek(0)
+        while chunk := spool.read(EXPORT_CHUNK_SIZE):
+            yield chunk
 
 @app.get("/tables/export/{document_id}/{table_index}")
 async def export_table(
@@ -877,37 +1329,27 @@ async def export_table(
     db: Session = Depends(get_db)
 ):
     """Export a specific table in various formats."""
-    from src.adapters.database.models import DocumentRecord
-    from fastapi.responses import Response
-    
-    # Get document with tables
-    document = db.query(DocumentRecord).filter(DocumentRecord.id == document_id).first()
-    if not document or not document.tables_data:
-        raise HTTPException(status_code=404, detail="Document or table not found")
-    
-    # Find the specific table
-    table_data = None
-    for table in document.tables_data:
-        if table.get("table_index") == table_index:
-            table_data = table
-            break
-    
+    table_data = _fetch_document_table(db, document_id, table_index)
     if not table_data:
-        raise HTTPException(status_code=404, detail="Table not found")
+        raise HTTPException(status_code=404, detail="Document or table not found")
     
     filename = f"table_{document_id}_{table_index}"
     
+    # CSV and Excel exports are streamed in chunks instead of being built as one response body
     if format == "csv":
-        content = table_data.get("table_csv", "")
-        media_type = "text/csv"
-        filename += ".csv"
+        return StreamingResponse(
+            _iter_csv_export(table_data),
+            media_type="text/csv",
+            headers={"Content-Disposition": f"attachment; filename={filename}.csv"}
+        )
     elif format == "excel":
-        # Create Excel file (would need openpyxl library)
-        content = table_data.get("table_csv", "")  # Fallback to CSV for now
-        media_type = "application/vnd.ms-excel"
-        filename += ".xlsx"
+        headers, rows = _table_headers_and_rows(table_data)
+        return StreamingResponse(
+            _iter_excel_export(headers, rows),
+            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            headers={"Content-Disposition": f"attachment; filename={filename}.xlsx"}
+        )
     else:  # json
-        import json
         table_json = {
             "headers": table_data.get("headers"),
             "rows": table_data.get("rows"),
@@ -917,7 +1359,7 @@ async def export_table(
                 "confidence_score": table_data.get("confidence_score")
             }
         }
-        content = json.dumps(table_json, indent=2)
+        content = dump_json(table_json, orjson.OPT_INDENT_2)
         media_type = "application/json"
         filename += ".json"
     
@@ -928,81 +1370,98 @@ async def export_table(
     )
 
 @app.get("/tables/stats")
-async def get_table_statistics(db: Session = Depends(get_db)):
-    """Get comprehensive table extraction statistics."""
-    from src.adapters.database.models import DocumentRecord
-    from sqlalchemy import text, func
-    
-    # Basic document and table statistics
-    doc_stats = db.query(
-        func.count(DocumentRecord.id).label('total_documents'),
-        func.sum(DocumentRecord.table_count).label('total_tables'),
-        func.avg(DocumentRecord.table_count).label('avg_tables_per_doc'),
-        func.count().filter(DocumentRecord.table_count > 0).label('docs_with_tables')
-    ).first()
-    
-    # Table type distribution
-    table_type_stats = db.execute(text("""
-        SELECT 
-            json_array_elements(tables_data)->>'table_type' as table_type,
-            COUNT(*) as count
-        FROM documents 
-        WHERE tables_data IS NOT NULL
-        GROUP BY json_array_elements(tables_data)->>'table_type'
-        ORDER BY count DESC
-    """)).fetchall()
-    
-    # Extraction method statistics
-    extraction_method_stats = db.execute(text("""
-        SELECT 
-            json_array_elements(tables_data)->>'extraction_method' as method,
-            COUNT(*) as count,
-            AVG((json_array_elements(tables_data)->>'confidence_score')::float) as avg_confidence,
-            AVG((json_array_elements(tables_data)->>'data_quality_score')::float) as avg_quality
-        FROM documents 
-        WHERE tables_data IS NOT NULL
-        GROUP BY json_array_elements(tables_data)->>'extraction_method'
-    """)).fetchall()
-    
-    # Data quality distribution
-    quality_stats = db.execute(text("""
-        SELECT 
-            CASE 
-                WHEN (json_array_elements(tables_data)->>'data_quality_score')::float >= 0.8 THEN 'high'
-                WHEN (json_array_elements(tables_data)->>'data_quality_score')::float >= 0.6 THEN 'medium'
-                ELSE 'low'
-            END as quality_level,
-            COUNT(*) as count
-        FROM documents 
-        WHERE tables_data IS NOT NULL
-        GROUP BY quality_level
-    """)).fetchall()
-    
-    return {
-        "document_statistics": {
-            "total_documents": doc_stats.total_documents or 0,
-            "documents_with_tables": doc_stats.docs_with_tables or 0,
-            "total_tables_extracted": doc_stats.total_tables or 0,
-            "average_tables_per_document": round(float(doc_stats.avg_tables_per_doc or 0), 2)
-        },
-        "table_type_distribution": {
-            row.table_type or "unknown": row.count 
-            for row in table_type_stats
-        },
-        "extraction_methods": {
-            row.method or "unknown": {
-                "count": row.count,
-                "avg_confidence": round(float(row.avg_confidence or 0), 2),
-                "avg_quality": round(float(row.avg_quality or 0), 2)
-            }
-            for row in extraction_method_stats
-        },
-        "data_quality_distribution": {
-            row.quality_level: row.count 
-            for row in quality_stats
-        }
-    }
+async def get_table_statistics(
+    ttl_ms: int = Query(60000, ge=0),
+    db: Session = Depends(get_db)
+):
+    """
+    Get comprehensive table extraction statistics.
+    The cached result is served for ttl_ms, then reused until the documents table
+    changes; ttl_ms=0 forces a fresh read.
+    """
+    payload = await _get_cached_snapshot(
+        "tables_stats", ttl_ms, lambda: _query_table_statistics(db),
+        watermark=lambda: _documents_watermark(db)
+    )
+    return Response(content=payload, media_type="application/json")
 
+def _documents_watermark(db: Session) -> tuple:
+    """
+    Cheap fingerprint of the documents table that changes on every insert, update and delete:
+    MAX(id) is read from the primary key index, the row counters from pg_stat_user_tables,
+    so no table scan is needed.
+    """
+    return tuple(db.execute(text(
+        "SELECT (SELECT MAX(id) FROM documents), n_tup_ins, n_tup_upd, n_tup_del "
+        "FROM pg_stat_user_tables WHERE relname = 'documents'"
+    )).one_or_none() or ())
+
+def _query_table_statistics(db: Session) -> bytes:
+    """Run the table statistics query and return the serialized JSON response body."""
+    # Single statement: the tables_data arrays are unrolled once (LATERAL), and all three
+    # table-level distributions come from one GROUPING SETS aggregation over that unroll.
+    # GROUPING() tells the sets apart: 3 = by table type, 5 = by method, 6 = by quality level.
+    return db.execute(text("""
+        WITH extracted_tables AS (
+            SELECT 
+                COALESCE(t.value->>'table_type', 'unknown') AS table_type,
+                COALESCE(t.value->>'extraction_method', 'unknown') AS method,
+                (t.value->>'confidence_score')::float AS confidence,
+                (t.value->>'data_quality_score')::float AS quality,
+                CASE 
+                    WHEN (t.value->>'data_quality_score')::float >= 0.8 THEN 'high'
+                    WHEN (t.value->>'data_quality_score')::float >= 0.6 THEN 'medium'
+                    ELSE 'low'
+                END AS quality_level
+            FROM documents d, LATERAL jsonb_array_elements(d.tables_data) t
+            WHERE d.tables_data IS NOT NULL
+            AND jsonb_typeof(d.tables_data) = 'array'
+        ),
+        grouped AS (
+            SELECT 
+                table_type,
+                method,
+                quality_level,
+                GROUPING(table_type, method, quality_level) AS grouping_set,
+                COUNT(*) AS count,
+                ROUND(COALESCE(AVG(confidence), 0)::numeric, 2) AS avg_confidence,
+                ROUND(COALESCE(AVG(quality), 0)::numeric, 2) AS avg_quality
+            FROM extracted_tables
+            GROUP BY GROUPING SETS (
+                (table_type),
+                (method),
+                (quality_level)
+            )
+        )
+        SELECT json_build_object(
+            'document_statistics', (
+                SELECT json_build_object(
+                    'total_documents', COUNT(*),
+                    'documents_with_tables', COUNT(*) FILTER (WHERE table_count > 0),
+                    'total_tables_extracted', COALESCE(SUM(table_count), 0),
+                    'average_tables_per_document', ROUND(COALESCE(AVG(table_count), 0)::numeric, 2)
+                )
+                FROM documents
+            ),
+            'table_type_distribution', COALESCE(
+                json_object_agg(table_type, count ORDER BY count DESC) FILTER (WHERE grouping_set = 3),
+                '{}'::json
+            ),
+            'extraction_methods', COALESCE(
+                json_object_agg(method, json_build_object(
+                    'count', count,
+                    'avg_confidence', avg_confidence,
+                    'avg_quality', avg_quality
+                )) FILTER (WHERE grouping_set = 5),
+                '{}'::json
+            ),
+            'data_quality_distribution', COALESCE(
+                json_object_agg(quality_level, count) FILTER (WHERE grouping_set = 6),
+                '{}'::json
+            )
+        )::text AS payload
+        FROM grouped
+    """)).scalar_one().encode()
 
 
 # Tabular Data Processing Functions
@@ -1014,101 +1473,99 @@ def _apply_size_limits_to_task_result(result: dict) -> dict:
     if not isinstance(result, dict):
         return result
     
-    # Create a copy to avoid modifying the original
-    limited_result = result.copy()
+    max_rows = config.large_file.max_response_rows
+    
+    # Only the changed keys are collected; the result is copied once at the end
+    limits = {}
     
     # Limit table_preview data if present (for tabular files)
-    if 'table_preview' in limited_result and isinstance(limited_result['table_preview'], list):
-        preview_data = limited_result['table_preview']
-        if len(preview_data) > config.large_file.max_response_rows:
-            limited_result['table_preview'] = preview_data[:config.large_file.max_response_rows]
-            limited_result['preview_truncated'] = True
-            limited_result['preview_sample_size'] = config.large_file.max_response_rows
-            limited_result['total_preview_rows'] = len(preview_data)
-            logger.info(f"Task result preview truncated: showing {config.large_file.max_response_rows} of {len(preview_data)} rows")
+    preview_data = result.get('table_preview')
+    if isinstance(preview_data, list):
+        if len(preview_data) > max_rows:
+            limits['table_preview'] = preview_data[:max_rows]
+            limits['preview_truncated'] = True
+            limits['preview_sample_size'] = max_rows
+            limits['total_preview_rows'] = len(preview_data)
+            logger.info(f"Task result preview truncated: showing {max_rows} of {len(preview_data)} rows")
         else:
-            limited_result['preview_truncated'] = False
+            limits['preview_truncated'] = False
     
     # Limit any tables data if present (for regular documents)
-    if 'tables' in limited_result and isinstance(limited_result['tables'], list):
-        limited_tables = []
-        for table in limited_result['tables']:
-            if isinstance(table, dict):
-                limited_table = table.copy()
-                
-                # Limit table rows/data
-                if 'rows' in limited_table and isinstance(limited_table['rows'], list):
-                    rows = limited_table['rows']
-                    if len(rows) > config.large_file.max_response_rows:
-                        limited_table['rows'] = rows[:config.large_file.max_response_rows]
-                        limited_table['response_truncated'] = True
-                        limited_table['response_sample_size'] = config.large_file.max_response_rows
-                        limited_table['total_rows_available'] = len(rows)
-                    else:
-                        limited_table['response_truncated'] = False
-                
-                # Limit table data field (for CSV-style data)
-                if 'data' in limited_table and isinstance(limited_table['data'], list):
-                    data = limited_table['data']
-                    if len(data) > config.large_file.max_response_rows:
-                        limited_table['data'] = data[:config.large_file.max_response_rows]
-                        limited_table['data_truncated'] = True
-                        limited_table['data_sample_size'] = config.large_file.max_response_rows
-                        limited_table['total_data_rows'] = len(data)
-                    else:
-                        limited_table['data_truncated'] = False
-                
-                limited_tables.append(limited_table)
-            else:
-                limited_tables.append(table)
-        
-        limited_result['tables'] = limited_tables
+    tables = result.get('tables')
+    if isinstance(tables, list):
+        limits['tables'] = [
+            _limit_task_result_table(table, max_rows) if isinstance(table, dict) else table
+            for table in tables
+        ]
     
     # Add metadata about size limiting
-    limited_result['size_limits_applied'] = True
-    limited_result['max_response_rows'] = config.large_file.max_response_rows
+    limits['size_limits_applied'] = True
+    limits['max_response_rows'] = max_rows
     
-    return limited_result
+    return {**result, **limits}
 
-def _limit_table_data_for_response(table_data: dict, max_rows: int = None) -> dict:
-    """Limit table data size for API responses to prevent browser crashes"""
-    if max_rows is None:
-        max_rows = config.large_file.max_response_rows
-    
-    # Create a copy to avoid modifying original data
-    limited_data = table_data.copy()
-    
-    # If data exists and is too large, truncate it
-    if 'data' in limited_data and isinstance(limited_data['data'], list):
-        original_size = len(limited_data['data'])
-        if original_size > max_rows:
-            limited_data['data'] = limited_data['data'][:max_rows]
-            limited_data['response_truncated'] = True
-            limited_data['response_sample_size'] = max_rows
-            limited_data['total_rows_available'] = original_size
-            logger.warning(f"Response truncated: showing {max_rows} of {original_size} rows to prevent browser crash")
+def _limit_task_result_table(table: dict, max_rows: int) -> dict:
+    """Limit the rows and key-value data of one task result table, copying it at most once."""
+    limits = {}
+    
+    # Limit table rows/data
+    rows = table.get('rows')
+    if isinstance(rows, list):
+        if len(rows) > max_rows:
+            limits['rows'] = rows[:max_rows]
+            limits['response_truncated'] = True
+            limits['response_sample_size'] = max_rows
+            limits['total_rows_available'] = len(rows)
+        else:
+            limits['response_truncated'] = False
+    
+    # Limit table data field (for CSV-style data)
+    data = table.get('data')
+    if isinstance(data, list):
+        if len(data) > max_rows:
+            limits['data'] = data[:max_rows]
+            limits['data_truncated'] = True
+            limits['data_sample_size'] = max_rows
+            limits['total_data_rows'] = len(data)
         else:
-            limited_data['response_truncated'] = False
-            limited_data['response_sample_size'] = original_size
+            limits['data_truncated'] = False
     
-    return limited_data
+    return {**table, **limits} if limits else table
 
-def _is_tabular_file(filename: str, content: bytes) -> bool:
-    """Check if uploaded file is tabular format (CSV, Excel, TSV)"""
+# Extensions handled as tabular data; TabularProcessor.detect_file_type always accepts these
+TABULAR_EXTENSIONS = frozenset({'.csv', '.tsv', '.xlsx', '.xls'})
+
+def _is_tabular_file(filename: str) -> bool:
+    """
+    Check if uploaded file is tabular format (CSV, Excel, TSV).
+    Only files with explicit tabular extensions qualify, so code files and other
+    structured text are never treated as tabular and the content isn't sniffed.
+    """
+    return bool(filename) and os.path.splitext(filename)[1].lower() in TABULAR_EXTENSIONS
+
+def _analyze_tabular_upload(content: bytes, file_type: str, filename: str) -> dict:
+    """
+    Parse a tabular file and build its table data, preview and statistics.
+    Runs in the extraction process pool; returns only plain, picklable values.
+    """
     from src.services.tabular_processor import TabularProcessor
     
-    # First check: only consider files with explicit tabular extensions
-    filename_lower = filename.lower()
-    if filename_lower.endswith(('.csv', '.tsv', '.xlsx', '.xls')):
-        return TabularProcessor.detect_file_type(filename, content) is not None
+    # Load as DataFrame
+    df = TabularProcessor.load_dataframe(content, file_type, filename)
     
-    # Don't treat code files or other structured text as tabular
-    return False
+    return {
+        # Create table data structure
+        "table_data": TabularProcessor.create_table_data(df, file_type, filename),
+        "row_count": len(df),
+        "column_count": len(df.columns),
+        "columns": list(df.columns),
+        "data_types": df.dtypes.astype(str).to_dict(),
+        "table_preview": TabularProcessor.get_preview_data(df),
+        "data_quality": TabularProcessor.analyze_data_quality(df)
+    }
 
-async def _process_tabular_as_table(file: UploadFile, content: bytes, start_time: float, db: Session):
+async def _process_tabular_as_table(file: UploadFile, content: bytes, start_time: float, db: Session, file_hash: str):
     """Process tabular file (CSV, Excel, TSV) as structured table data"""
-    import hashlib
-    from src.adapters.database.models import DocumentRecord
     from src.services.tabular_processor import TabularProcessor
     
     try:
@@ -1117,52 +1574,39 @@ async def _process_tabular_as_table(file: UploadFile, content: bytes, start_time
         if not file_type:
             raise ValueError("Unable to detect tabular file type")
         
-        # Load as DataFrame
-        df = TabularProcessor.load_dataframe(content, file_type, file.filename)
-        
-        # Create table data structure
-        table_data = TabularProcessor.create_table_data(df, file_type, file.filename)
+        # Parsing is CPU-bound; run it in the process pool so the event loop stays free
+        loop = asyncio.get_running_loop()
+        analysis = await loop.run_in_executor(
+            _get_extraction_pool(), _analyze_tabular_upload, content, file_type, file.filename
+        )
+        table_data = analysis["table_data"]
+        row_count, column_count = analysis["row_count"], analysis["column_count"]
         
-        # Store in database
-        file_hash = hashlib.sha256(content).hexdigest()
-        existing = db.query(DocumentRecord).filter(DocumentRecord.file_hash == file_hash).first()
-        
-        if existing:
-            # Update existing record
-            existing.tables_data = [table_data]
-            existing.table_count = 1
-            action = "updated"
-            document_id = existing.id
-        else:
-            # Create new record
-            new_doc = DocumentRecord(
-                filename=file.filename,
-                file_extension=f".{file_type}",  # Set file extension
-                file_size=len(content),  # Set file size in bytes
-                file_hash=file_hash,
-                full_text=f"{file_type.upper()} file with {len(df)} rows and {len(df.columns)} columns",
-                page_count=1,
-                has_ocr_content=0,  # Use integer 0 instead of boolean False
-                processing_method=f"{file_type}_parser",
-                table_count=1,
-                tables_data=[table_data]
-            )
-            db.add(new_doc)
-            db.commit()
-            db.refresh(new_doc)
-            action = "created"
-            document_id = new_doc.id
-        
-        db.commit()
+        # Store in database (file_hash was computed while streaming the upload);
+        # an already stored duplicate gets the new table data. The blocking database
+        # round-trips run in a worker thread so other requests keep being served.
+        document_id, inserted = await asyncio.to_thread(_upsert_document, db, dict(
+            filename=file.filename,
+            file_extension=f".{file_type}",  # Set file extension
+            file_size=len(content),  # Set file size in bytes
+            file_hash=file_hash,
+            full_text=f"{file_type.upper()} file with {row_count} rows and {column_count} columns",
+            page_count=1,
+            has_ocr_content=False,
+            processing_method=f"{file_type}_parser",
+            table_count=1,
+            tables_data=[table_data]
+        ), update_fields=("tables_data", "table_count"), content=content)
+        action = "created" if inserted else "updated"
         
         # Calculate processing time
         processing_time = round((time.time() - start_time) * 1000)
         
         # Return table-formatted response
-        return {
+        return FastJSONResponse({
             "id": document_id,
             "filename": file.filename,
-            "full_text": f"{file_type.upper()} table with {len(df)} rows and {len(df.columns)} columns",
+            "full_text": f"{file_type.upper()} table with {row_count} rows and {column_count} columns",
             "page_count": 1,
             "has_ocr_content": 0,  # Use integer 0 instead of boolean False
             "processing_method": f"{file_type}_parser",
@@ -1172,14 +1616,14 @@ async def _process_tabular_as_table(file: UploadFile, content: bytes, start_time
             "processing_time_ms": processing_time,
             "file_size_bytes": len(content),
             "data_format": "table",
-            "table_preview": TabularProcessor.get_preview_data(df),
+            "table_preview": analysis["table_preview"],
             "table_info": {
-                "shape": f"{len(df)} rows × {len(df.columns)} columns",
-                "columns": list(df.columns),
-                "data_types": {col: str(df[col].dtype) for col in df.columns}
+                "shape": f"{row_count} rows × {column_count} columns",
+                "columns": analysis["columns"],
+                "data_types": analysis["data_types"]
             },
-            "data_quality": TabularProcessor.analyze_data_quality(df)
-        }
+            "data_quality": analysis["data_quality"]
+        })
         
     except Exception as e:
         logger.error(f"Tabular file processing failed: {e}")
@@ -1195,19 +1639,24 @@ async def _process_tabular_as_table(file: UploadFile, content: bytes, start_time
 @app.post("/extract/table/")
 async def extract_tabular_data(file: UploadFile = File(...), db: Session = Depends(get_db)):
     """Dedicated endpoint for tabular data processing (CSV, Excel, TSV)"""
-    import time
     start_time = time.time()
     
-    content = await file.read()
-    
-    if not _is_tabular_file(file.filename, content):
+    # Rejected by extension before any of the upload is read
+    if not _is_tabular_file(file.filename):
         raise HTTPException(status_code=400, detail="File is not a valid tabular format (CSV, Excel, TSV)")
     
-    return await _process_tabular_as_table(file, content, start_time, db)
+    document = await _read_upload(file)
+    content = document.content
+    
+    return await _process_tabular_as_table(file, content, start_time, db, file_hash=document.file_hash)
 
 @app.get("/health")
-async def health_check():
-    """Enhanced health check with table extraction status."""
+async def health_check(ttl_ms: int = Query(60000, ge=0)):
+    """Enhanced health check with table extraction status (cached for ttl_ms, 0 for a fresh check)."""
+    return FastJSONResponse(await _get_cached_snapshot("health", ttl_ms, _collect_health_status))
+
+def _collect_health_status() -> dict:
+    """Check backend and table extraction capabilities."""
     health = {
         "status": "healthy",
         "backend": "celery" if USE_CELERY else "background_tasks"
@@ -0,0 +1,12 @@
+# src/adapters/celery_worker.py
+"""
+Celery worker entry point.
+
+Tabular files and other documents use separate queues. Start workers with:
+    celery -A src.adapters.celery_worker worker -Q tabular --concurrency=8
+    celery -A src.adapters.celery_worker worker -Q documents -O fair --concurrency=2
+"""
+
+from src.adapters.api import get_celery_app
+
+celery_app = get_celery_app()
@@ -4,9 +4,13 @@ Database initialization script for PostgreSQL Full-Text Search setup.
 This script ensures proper FTS configuration and indexes.
 """
 
+import os
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
+class SchemaMigrationError(RuntimeError):
+    """A schema change the application can't run without could not be applied."""
+
 def setup_fts_extensions(db: Session):
     """Set up PostgreSQL extensions and configurations for FTS."""
     
@@ -18,6 +22,15 @@ def setup_fts_extensions(db: Session):
     except Exception as e:
         print(f"Warning: Could not enable unaccent extension: {e}")
     
+    # Trigram matching lets GIN indexes serve unanchored ILIKE '%term%' lookups
+    try:
+        db.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm;"))
+        db.commit()
+        print("✓ pg_trgm extension enabled")
+    except Exception as e:
+        db.rollback()
+        print(f"Warning: Could not enable pg_trgm extension: {e}")
+    
     # Create custom text search configuration (optional, for better language support)
     try:
         db.execute(text("""
@@ -39,215 +52,375 @@ def setup_fts_extensions(db: Session):
     except Exception as e:
         print(f"Warning: Could not create custom FTS configuration: {e}")
 
+# GIN indexes over document content. Inserts go to a pending list of up to 16MB
+# (merged into the index in bulk) instead of updating the posting trees per row.
+GIN_INDEXES = (
+    "ix_documents_search_vector_gin",
+    "ix_documents_tables_text_trgm",
+    "ix_documents_tables_fts",
+)
+GIN_INDEX_OPTIONS = "fastupdate = on, gin_pending_list_limit = 16384"
+
+# Indexes built by create_fts_indexes: (name, CREATE statement, description)
+FTS_INDEXES = (
+    # Document search queries the search_vector column itself, so no separate
+    # to_tsvector(full_text) expression index is kept
+    (
+        "ix_documents_search_vector_gin",
+        f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_documents_search_vector_gin "
+        f"ON documents USING gin(search_vector) WITH ({GIN_INDEX_OPTIONS})",
+        "GIN index on search_vector",
+    ),
+    # Indexes for common queries
+    (
+        "ix_documents_processing_method",
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_documents_processing_method ON documents(processing_method)",
+        "processing method index",
+    ),
+    (
+        "ix_documents_has_ocr",
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_documents_has_ocr ON documents(has_ocr_content)",
+        "OCR flag index",
+    ),
+    (
+        "ix_documents_created_at_desc",
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_documents_created_at_desc ON documents(created_at DESC)",
+        "creation date index",
+    ),
+    # Trigram GIN index for table content search (/tables/search filters on tables_data::text ILIKE)
+    (
+        "ix_documents_tables_text_trgm",
+        f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_documents_tables_text_trgm "
+        f"ON documents USING gin ((tables_data::text) gin_trgm_ops) WITH ({GIN_INDEX_OPTIONS})",
+        "trigram GIN index on table content",
+    ),
+    # Full-text GIN index over the string values of table content (/tables/search?mode=fulltext).
+    # An expression index is only used when the query repeats the expression exactly, so
+    # the document filter of search_tables must stay in sync with it.
+    (
+        "ix_documents_tables_fts",
+        f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_documents_tables_fts "
+        f"ON documents USING gin (jsonb_to_tsvector('english', tables_data, '[\"string\"]')) WITH ({GIN_INDEX_OPTIONS})",
+        "full-text GIN index on table content",
+    ),
+    # Unique deduplication key, required by the ON CONFLICT upserts of uploaded documents
+    (
+        "ux_documents_file_hash_size",
+        "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ux_documents_file_hash_size ON documents(file_hash, file_size)",
+        "unique deduplication index",
+    ),
+)
+# Indexes whose build failure aborts startup instead of printing a warning
+REQUIRED_INDEXES = ("ux_documents_file_hash_size",)
+# Opt-in: delete duplicate (file_hash, file_size) documents at startup so that
+# ux_documents_file_hash_size can be built (see deduplicate_documents)
+DEDUPLICATE_DOCUMENTS = os.getenv('DEDUPLICATE_DOCUMENTS', 'false').lower() == 'true'
+
 def create_fts_indexes(db: Session):
-    """Create GIN indexes for full-text search performance."""
+    """
+    Create GIN indexes for full-text search performance, and the lookup indexes of documents.
+    
+    Indexes are built with CREATE INDEX CONCURRENTLY, so writes to documents continue
+    during a build. CONCURRENTLY can't run inside a transaction, so the builds use an
+    autocommit connection of their own. A failed concurrent build leaves an INVALID
+    index behind, which is dropped so the next start builds it again.
+    
+    Raises:
+        SchemaMigrationError: If one of REQUIRED_INDEXES can't be built
+    """
+    # A build waits for every transaction open on documents, including one of this session
+    db.commit()
+    
+    with db.get_bind().connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        invalid_indexes = set(conn.execute(text("""
+            SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE i.indrelid = 'documents'::regclass AND NOT i.indisvalid;
+        """)).scalars())
+        
+        # Second GIN index on search_vector declared by earlier versions of the model
+        try:
+            conn.execute(text("DROP INDEX CONCURRENTLY IF EXISTS ix_documents_search_vector;"))
+        except Exception as e:
+            print(f"Warning: Could not drop redundant index ix_documents_search_vector: {e}")
+        
+        for index_name, create_statement, description in FTS_INDEXES:
+            try:
+                if index_name in invalid_indexes:
+                    conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name};"))
+                conn.execute(text(create_statement + ";"))
+                print(f"✓ {description.capitalize()} created")
+            except Exception as e:
+                try:
+                    conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name};"))
+                except Exception:
+                    pass
+                if index_name in REQUIRED_INDEXES:
+                    raise SchemaMigrationError(
+                        f"Could not create {description}: {e}. Remove duplicate documents, "
+                        f"or set DEDUPLICATE_DOCUMENTS=true to keep only the newest of each"
+                    ) from e
+                print(f"Warning: Could not create {description}: {e}")
+        
+        # Indexes created before the pending list options were set
+        try:
+            for index_name in GIN_INDEXES:
+                conn.execute(text(f"ALTER INDEX IF EXISTS {index_name} SET ({GIN_INDEX_OPTIONS});"))
+        except Exception as e:
+            print(f"Warning: Could not set GIN pending list options: {e}")
+
+# Documents whose tables_text is backfilled (and committed) per batch during migration
+TABLES_TEXT_BACKFILL_BATCH_SIZE = 500
+# Upper bound on each backfill batch's statements, so a pathological batch fails the
+# migration instead of holding row locks indefinitely
+TABLES_TEXT_BACKFILL_STATEMENT_TIMEOUT = "60s"
+
+# Indexes maintained on every rewritten documents row; dropped for the bulk backfill
+# and rebuilt in one pass by create_fts_indexes
+BULK_DROPPED_INDEXES = (
+    "ix_documents_search_vector_gin",
+    "ix_documents_tables_text_trgm",
+    "ix_documents_tables_fts",
+)
+
+def migrate_search_vector(db: Session):
+    """
+    Convert a trigger-maintained search_vector into the generated column of the model.
+    The old trigger and its plpgsql functions are dropped, and tables_text is
+    backfilled in Python for documents stored before it existed.
+    
+    The backfill rewrites every document with tables, so it runs as a bulk load:
+    the GIN indexes are dropped first and rebuilt afterwards by create_fts_indexes,
+    and each batch is committed, so an interrupted backfill resumes where it stopped.
+    """
+    from src.adapters.database.models import SEARCH_VECTOR_EXPRESSION
+    from src.adapters.repositories import build_tables_text
     
-    # Create GIN index on search_vector if it doesn't exist
     try:
-        db.execute(text("""
-            CREATE INDEX IF NOT EXISTS ix_documents_search_vector_gin 
-            ON documents USING gin(search_vector);
+        # Committed on its own: the model writes tables_text even if the conversion below fails
+        db.execute(text("ALTER TABLE documents ADD COLUMN IF NOT EXISTS tables_text TEXT;"))
+        db.commit()
+        
+        is_generated = db.execute(text("""
+            SELECT attgenerated = 's' FROM pg_attribute
+            WHERE attrelid = 'documents'::regclass AND attname = 'search_vector' AND NOT attisdropped;
+        """)).scalar()
+        if is_generated:
+            return
+        
+        db.execute(text(f"""
+            DROP TRIGGER IF EXISTS update_documents_search_vector ON documents;
+            DROP FUNCTION IF EXISTS update_search_vector();
+            DROP FUNCTION IF EXISTS extract_table_text(JSON);
+            DROP INDEX IF EXISTS {", ".join(BULK_DROPPED_INDEXES)};
+        """))
+        db.commit()
+        
+        # Walk the documents by id, one bounded transaction per batch
+        backfilled = 0
+        last_id = 0
+        while True:
+            db.execute(
+                text("SELECT set_config('statement_timeout', :timeout, true)"),
+                {"timeout": TABLES_TEXT_BACKFILL_STATEMENT_TIMEOUT}
+            )
+            batch = db.execute(text("""
+                SELECT id, tables_data FROM documents
+                WHERE id > :last_id AND tables_data IS NOT NULL AND tables_text IS NULL
+                ORDER BY id
+                LIMIT :limit
+            """), {"last_id": last_id, "limit": TABLES_TEXT_BACKFILL_BATCH_SIZE}).all()
+            if not batch:
+                db.commit()
+                break
+            
+            db.execute(
+                text("UPDATE documents SET tables_text = :tables_text WHERE id = :id"),
+                [{"id": row.id, "tables_text": build_tables_text(row.tables_data)} for row in batch]
+            )
+            db.commit()
+            backfilled += len(batch)
+            last_id = batch[-1].id
+        
+        # Adding the generated column rewrites the table once; create_fts_indexes then
+        # builds its GIN index over the finished column
+        db.execute(text(f"""
+            ALTER TABLE documents DROP COLUMN IF EXISTS search_vector;
+            ALTER TABLE documents ADD COLUMN search_vector tsvector
+                GENERATED ALWAYS AS ({SEARCH_VECTOR_EXPRESSION}) STORED;
         """))
         db.commit()
-        print("✓ GIN index on search_vector created")
+        print(f"✓ search_vector converted to a generated column ({backfilled} documents' table text backfilled)")
     except Exception as e:
-        print(f"Warning: Could not create GIN index: {e}")
-    
-    # Create additional indexes for common queries
+        # create_fts_indexes still runs afterwards and recreates any dropped index
+        db.rollback()
+        print(f"Warning: Could not convert search_vector to a generated column: {e}")
+        import traceback
+        traceback.print_exc()
+
+def migrate_tables_data_jsonb(db: Session):
+    """
+    Convert a JSON tables_data column to the JSONB type of the model.
+    The conversion rewrites the table, so the indexes over tables_data are dropped
+    first and rebuilt afterwards by create_fts_indexes.
+    """
     try:
+        column_type = db.execute(text("""
+            SELECT format_type(atttypid, atttypmod) FROM pg_attribute
+            WHERE attrelid = 'documents'::regclass AND attname = 'tables_data' AND NOT attisdropped;
+        """)).scalar()
+        if column_type != "json":
+            return
+        
         db.execute(text("""
-            CREATE INDEX IF NOT EXISTS ix_documents_processing_method 
-            ON documents(processing_method);
-        """))
-        db.execute(text("""
-            CREATE INDEX IF NOT EXISTS ix_documents_has_ocr 
-            ON documents(has_ocr_content);
-        """))
-        db.execute(text("""
-            CREATE INDEX IF NOT EXISTS ix_documents_created_at_desc 
-            ON documents(created_at DESC);
+            DROP INDEX IF EXISTS ix_documents_tables_text_trgm, ix_documents_tables_fts;
+            ALTER TABLE documents ALTER COLUMN tables_data TYPE jsonb USING tables_data::jsonb;
         """))
         db.commit()
-        print("✓ Additional performance indexes created")
+        print("✓ tables_data converted to JSONB")
     except Exception as e:
-        print(f"Warning: Could not create additional indexes: {e}")
+        db.rollback()
+        print(f"Warning: Could not convert tables_data to JSONB: {e}")
 
-def create_fts_trigger(db: Session):
-    """Create trigger to automatically update search_vector on INSERT/UPDATE, including table data."""
-    
+def migrate_table_rows_jsonb(db: Session):
+    """
+    Convert the JSON row_data column of document_table_rows to the JSONB type of the model.
+    The conversion rewrites the table, which only holds the normalized table rows.
+    """
     try:
-        # Create helper function to extract text from tables_data JSON
-        db.execute(text("""
-            CREATE OR REPLACE FUNCTION extract_table_text(tables_data JSON) 
-            RETURNS TEXT AS $$
-            DECLARE
-                table_text TEXT := '';
-                table_record JSON;
-                cell_value TEXT;
-                row_elem JSON;
-                data_elem JSON;
-            BEGIN
-                -- Return empty if no tables
-                IF tables_data IS NULL THEN
-                    RETURN '';
-                END IF;
-                
-                -- Loop through each table in the array
-                FOR table_record IN SELECT * FROM json_array_elements(tables_data)
-                LOOP
-                    -- Extract table title
-                    table_text := table_text || ' ' || coalesce(table_record->>'title', '');
-                    
-                    -- Extract headers
-                    IF table_record->'headers' IS NOT NULL THEN
-                        SELECT string_agg(value::text, ' ') INTO cell_value
-                        FROM json_array_elements_text(table_record->'headers');
-                        table_text := table_text || ' ' || coalesce(cell_value, '');
-                    END IF;
-                    
-                    -- Extract row data (limit to prevent performance issues)
-                    IF table_record->'rows' IS NOT NULL THEN
-                        -- For rows that are arrays of values
-                        SELECT string_agg(elem::text, ' ') INTO cell_value
-                        FROM (
-                            SELECT json_array_elements_text(row_elem) as elem
-                            FROM json_array_elements(table_record->'rows') as row_elem
-                            LIMIT 1000  -- Limit rows to index for performance
-                        ) subq;
-                        table_text := table_text || ' ' || coalesce(cell_value, '');
-                    END IF;
-                    
-                    -- Extract data field (for key-value format tables)
-                    IF table_record->'data' IS NOT NULL THEN
-                        -- Simply convert the data array to text for indexing
-                        cell_value := table_record->'data'::text;
-                        table_text := table_text || ' ' || coalesce(cell_value, '');
-                    END IF;
-                END LOOP;
-                
-                RETURN table_text;
-            END;
-            $$ LANGUAGE plpgsql IMMUTABLE;
-        """))
+        column_type = db.execute(text("""
+            SELECT format_type(atttypid, atttypmod) FROM pg_attribute
+            WHERE attrelid = 'document_table_rows'::regclass AND attname = 'row_data' AND NOT attisdropped;
+        """)).scalar()
+        if column_type != "json":
+            return
         
-        # Create trigger function that includes table data
-        db.execute(text("""
-            CREATE OR REPLACE FUNCTION update_search_vector() 
-            RETURNS TRIGGER AS $$
-            DECLARE
-                table_content TEXT := '';
-            BEGIN
-                -- Extract table text if tables_data exists
-                IF NEW.tables_data IS NOT NULL THEN
-                    table_content := extract_table_text(NEW.tables_data);
-                END IF;
-                
-                -- Create search vector from all searchable fields including tables
-                -- Limit total text to 900KB to stay under tsvector's 1MB limit
-                NEW.search_vector := to_tsvector('english', 
-                    substring(
-                        coalesce(NEW.filename, '') || ' ' || 
-                        coalesce(NEW.full_text, '') || ' ' || 
-                        coalesce(NEW.author, '') || ' ' ||
-                        coalesce(table_content, '')
-                        from 1 for 900000
-                    )
-                );
-                RETURN NEW;
-            END;
-            $$ LANGUAGE plpgsql;
-        """))
+        db.execute(text("ALTER TABLE document_table_rows ALTER COLUMN row_data TYPE jsonb USING row_data::jsonb;"))
+        db.commit()
+        print("✓ document_table_rows.row_data converted to JSONB")
+    except Exception as e:
+        db.rollback()
+        print(f"Warning: Could not convert document_table_rows.row_data to JSONB: {e}")
+
+def migrate_narrow_columns(db: Session):
+    """
+    Convert the integer has_ocr_content flag to boolean and table_count to smallint,
+    as declared by the model. Both columns are converted in one table rewrite.
+    """
+    try:
+        column_type = db.execute(text("""
+            SELECT format_type(atttypid, atttypmod) FROM pg_attribute
+            WHERE attrelid = 'documents'::regclass AND attname = 'has_ocr_content' AND NOT attisdropped;
+        """)).scalar()
+        if column_type != "integer":
+            return
         
-        # Create trigger
         db.execute(text("""
-            DROP TRIGGER IF EXISTS update_documents_search_vector ON documents;
-            CREATE TRIGGER update_documents_search_vector
-                BEFORE INSERT OR UPDATE ON documents
-                FOR EACH ROW EXECUTE FUNCTION update_search_vector();
+            ALTER TABLE documents
+                ALTER COLUMN has_ocr_content TYPE boolean USING has_ocr_content <> 0,
+                ALTER COLUMN table_count TYPE smallint;
         """))
+        db.commit()
+        print("✓ has_ocr_content and table_count narrowed to boolean and smallint")
+    except Exception as e:
+        db.rollback()
+        print(f"Warning: Could not narrow has_ocr_content and table_count: {e}")
+
+def migrate_text_storage(db: Session):
+    """
+    Drop the unused full_text_compressed column (full_text is the only copy of the text;
+    TOAST already compresses it) and compress new full_text values with lz4 (PostgreSQL 14+).
+    """
+    try:
+        db.execute(text("ALTER TABLE documents DROP COLUMN IF EXISTS full_text_compressed;"))
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"Warning: Could not drop full_text_compressed: {e}")
+    
+    try:
+        db.execute(text("ALTER TABLE documents ALTER COLUMN full_text SET COMPRESSION lz4;"))
+        db.commit()
+        print("✓ full_text stored with lz4 compression")
+    except Exception as e:
+        # Servers before 14 or built without lz4 keep the default pglz compression
+        db.rollback()
+        print(f"Warning: Could not enable lz4 compression for full_text: {e}")
+
+def deduplicate_documents(db: Session):
+    """
+    Delete duplicate (file_hash, file_size) documents stored before the unique
+    deduplication index existed, keeping the newest row of each, so that
+    ux_documents_file_hash_size can be built. The table rows of deleted
+    documents go with them (ON DELETE CASCADE).
+    
+    Deleting documents is only done when DEDUPLICATE_DOCUMENTS=true; otherwise the
+    duplicates are reported and the index build fails startup. Deleted ids are printed.
+    """
+    try:
+        index_is_valid = db.execute(text("""
+            SELECT i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE c.relname = 'ux_documents_file_hash_size';
+        """)).scalar()
+        if index_is_valid:
+            return
+        
+        # Documents with a newer row for the same file
+        is_duplicate = """
+            EXISTS (SELECT 1 FROM documents newer WHERE newer.file_hash = d.file_hash
+                    AND newer.file_size = d.file_size AND newer.id > d.id)
+        """
+        if not DEDUPLICATE_DOCUMENTS:
+            duplicates = db.execute(text(f"SELECT COUNT(*) FROM documents d WHERE {is_duplicate};")).scalar()
+            db.rollback()
+            if duplicates:
+                print(f"Warning: {duplicates} duplicate documents block the unique deduplication index; "
+                      f"set DEDUPLICATE_DOCUMENTS=true to delete them (the newest of each is kept)")
+            return
         
+        deleted_ids = db.execute(text(f"DELETE FROM documents d WHERE {is_duplicate} RETURNING d.id;")).scalars().all()
         db.commit()
-        print("✓ Automatic search_vector update trigger created (with table data indexing)")
+        if deleted_ids:
+            print(f"✓ {len(deleted_ids)} duplicate documents deleted (ids: {', '.join(map(str, sorted(deleted_ids)))})")
     except Exception as e:
-        print(f"Warning: Could not create FTS trigger: {e}")
-        import traceback
-        traceback.print_exc()
+        db.rollback()
+        print(f"Warning: Could not remove duplicate documents: {e}")
+
+def flush_gin_pending_lists(db: Session):
+    """
+    Merge the pending lists of the GIN indexes into the indexes.
+    Searches scan the pending list linearly, so it is flushed at startup and should be
+    flushed after bulk loads; autovacuum flushes it otherwise.
+    """
+    try:
+        for index_name in GIN_INDEXES:
+            db.execute(
+                text("SELECT gin_clean_pending_list(c.oid) FROM pg_class c WHERE c.relname = :index_name"),
+                {"index_name": index_name}
+            )
+        db.commit()
+        print("✓ GIN pending lists flushed")
+    except Exception as e:
+        db.rollback()
+        print(f"Warning: Could not flush GIN pending lists: {e}")
 
 def initialize_fts(db: Session):
     """Initialize all FTS components."""
     print("Initializing PostgreSQL Full-Text Search...")
     
     setup_fts_extensions(db)
+    migrate_search_vector(db)
+    migrate_tables_data_jsonb(db)
+    migrate_table_rows_jsonb(db)
+    migrate_narrow_columns(db)
+    migrate_text_storage(db)
+    deduplicate_documents(db)
     create_fts_indexes(db)
-    create_fts_trigger(db)
+    flush_gin_pending_lists(db)
     
     print("✓ PostgreSQL FTS initialization complete")
 
-def update_existing_search_vectors(db: Session):
-    """Update search vectors for existing documents, including table data."""
-    try:
-        # First, ensure the helper function exists
-        db.execute(text("""
-            CREATE OR REPLACE FUNCTION extract_table_text(tables_data JSON) 
-            RETURNS TEXT AS $$
-            DECLARE
-                table_text TEXT := '';
-                table_record JSON;
-                cell_value TEXT;
-            BEGIN
-                IF tables_data IS NULL THEN
-                    RETURN '';
-                END IF;
-                
-                FOR table_record IN SELECT * FROM json_array_elements(tables_data)
-                LOOP
-                    table_text := table_text || ' ' || coalesce(table_record->>'title', '');
-                    
-                    IF table_record->'headers' IS NOT NULL THEN
-                        SELECT string_agg(value::text, ' ') INTO cell_value
-                        FROM json_array_elements_text(table_record->'headers');
-                        table_text := table_text || ' ' || coalesce(cell_value, '');
-                    END IF;
-                    
-                    IF table_record->'rows' IS NOT NULL THEN
-                        SELECT string_agg(elem::text, ' ') INTO cell_value
-                        FROM (
-                            SELECT json_array_elements_text(row_elem) as elem
-                            FROM json_array_elements(table_record->'rows') as row_elem
-                            LIMIT 1000
-                        ) subq;
-                        table_text := table_text || ' ' || coalesce(cell_value, '');
-                    END IF;
-                    
-                    IF table_record->'data' IS NOT NULL THEN
-                        -- Simply convert the data array to text for indexing
-                        cell_value := table_record->'data'::text;
-                        table_text := table_text || ' ' || coalesce(cell_value, '');
-                    END IF;
-                END LOOP;
-                
-                RETURN table_text;
-            END;
-            $$ LANGUAGE plpgsql IMMUTABLE;
-        """))
-        
-        # Update all documents to include table data in search_vector
-        # Limit total text to 900KB to stay under tsvector's 1MB limit
-        result = db.execute(text("""
-            UPDATE documents 
-            SET search_vector = to_tsvector('english', 
-                substring(
-                    coalesce(filename, '') || ' ' || 
-                    coalesce(full_text, '') || ' ' || 
-                    coalesce(author, '') || ' ' ||
-                    coalesce(extract_table_text(tables_data), '')
-                    from 1 for 900000
-                )
-            );
-        """))
-        db.commit()
-        print(f"✓ Updated search vectors for {result.rowcount} existing documents (including table data)")
-    except Exception as e:
-        print(f"Warning: Could not update existing search vectors: {e}")
-        import traceback
-        traceback.print_exc()
+if __name__ == "__main__":
+    # One-shot setup for deployments that don't start through src/app_main.py:
+    #   python -m src.adapters.database.init_fts
+    from src.adapters.dependencies import init_database
+    init_database()
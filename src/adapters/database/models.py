@@ -1,42 +1,62 @@
 # src/infrastructure/database/models.py
-from sqlalchemy import Column, Integer, String, Text, DateTime, LargeBinary, Index, JSON
+from sqlalchemy import Column, Integer, SmallInteger, Boolean, String, Text, DateTime, Index, ForeignKey, Computed
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
-from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.dialects.postgresql import TSVECTOR, JSONB
 from datetime import datetime
 
 Base = declarative_base()
 
+# Expression of the generated search_vector column. Table content is flattened into
+# tables_text when documents are written; the total is limited to 900KB to stay under
+# tsvector's 1MB limit. full_text is cut to that limit before concatenating, so a
+# multi-megabyte text isn't copied whole only to be truncated (tables_text is already
+# capped when written, filename and author by their column size).
+SEARCH_VECTOR_EXPRESSION = """to_tsvector('english',
+    substring(
+        coalesce(filename, '') || ' ' ||
+        left(coalesce(full_text, ''), 900000) || ' ' ||
+        coalesce(author, '') || ' ' ||
+        coalesce(tables_text, '')
+        from 1 for 900000
+    )
+)"""
+
 class DocumentRecord(Base):
     """
     SQLAlchemy model for storing document metadata and extracted data.
     Enhanced with PostgreSQL Full-Text Search capabilities.
     """
     __tablename__ = "documents"
+    # Don't fetch the generated search_vector back after every INSERT
+    __mapper_args__ = {"eager_defaults": False}
     
     id = Column(Integer, primary_key=True, index=True)
     filename = Column(String(255), nullable=False, index=True)
     file_extension = Column(String(10), nullable=False)
     file_size = Column(Integer, nullable=False)  # Size in bytes
     
-    # Extracted content (compressed for efficiency)
-    full_text_compressed = Column(LargeBinary, nullable=True)  # gzip compressed text
-    full_text = Column(Text, nullable=False)  # Complete extracted text
+    # Extracted content (compressed by PostgreSQL's TOAST storage, with lz4 where available).
+    # Large columns are deferred: loaded together on first access, or up front with undefer_group("content")
+    full_text = deferred(Column(Text, nullable=False), group="content")  # Complete extracted text
     page_count = Column(Integer, default=1)
     word_count = Column(Integer, default=0)
     author = Column(String(255), nullable=True)
-    file_hash = Column(String(64), nullable=True, index=True)  # For deduplication
+    file_hash = Column(String(64), nullable=True, index=True)  # xxHash3-64 hex digest for deduplication
     
     # OCR and processing metadata
-    has_ocr_content = Column(Integer, default=0)  # Boolean: 1 if OCR was used
+    has_ocr_content = Column(Boolean, default=False)  # True if OCR was used
     processing_method = Column(String(50), nullable=True)  # 'text_extraction', 'ocr', 'hybrid'
     
-    # Full-text search vector (automatically maintained by PostgreSQL)
-    search_vector = Column(TSVECTOR)
+    # Full-text search vector (generated and stored by PostgreSQL, only used in queries)
+    search_vector = deferred(Column(TSVECTOR, Computed(SEARCH_VECTOR_EXPRESSION, persisted=True)))
     
-    # Table extraction data stored as JSON
-    tables_data = Column(JSON, nullable=True)     # All extracted tables as JSON
-    table_count = Column(Integer, default=0)      # Number of tables found
+    # Table extraction data stored as JSONB (pre-parsed, so JSON operators don't re-parse it).
+    # JSONB doesn't keep object key order; column order comes from each table's 'headers'.
+    tables_data = deferred(Column(JSONB, nullable=True), group="content")  # All extracted tables
+    tables_text = deferred(Column(Text, nullable=True))  # Searchable text of tables_data, only used by search_vector
+    table_count = Column(SmallInteger, default=0)  # Number of tables found
     
     # Metadata
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -45,6 +65,24 @@ class DocumentRecord(Base):
     def __repr__(self):
         return f"<DocumentRecord(id={self.id}, filename='{self.filename}', pages={self.page_count}, tables={self.table_count})>"
 
+class DocumentTableRow(Base):
+    """
+    One key-value record of a document table, stored separately from tables_data
+    so table pages can be read with an indexed range scan.
+    """
+    __tablename__ = "document_table_rows"
+    
+    id = Column(Integer, primary_key=True)
+    document_id = Column(Integer, ForeignKey("documents.id", ondelete="CASCADE"), nullable=False)
+    table_index = Column(Integer, nullable=False)  # Matches the table's table_index in tables_data
+    row_index = Column(Integer, nullable=False)    # Position of the record within the table
+    row_data = Column(JSONB, nullable=False)  # Parsed like tables_data, so JSONB operators and indexes apply
+    
+    def __repr__(self):
+        return f"<DocumentTableRow(document_id={self.document_id}, table={self.table_index}, row={self.row_index})>"
+
 # Create indexes for performance
-Index('ix_documents_search_vector', DocumentRecord.search_vector, postgresql_using='gin')
-Index('ix_documents_table_count', DocumentRecord.table_count)
\ No newline at end of file
+Index('ix_documents_table_count', DocumentRecord.table_count)
+# Deduplication key; uploads are upserted with ON CONFLICT against it
+Index('ux_documents_file_hash_size', DocumentRecord.file_hash, DocumentRecord.file_size, unique=True)
+Index('ix_document_table_rows_position', DocumentTableRow.document_id, DocumentTableRow.table_index, DocumentTableRow.row_index)
\ No newline at end of file
@@ -14,9 +14,11 @@ Key responsibilities:
 
 import os
 import logging
-from typing import Dict, Generator
+import functools
+from typing import Callable, Generator, Iterator, Mapping
 
 from dotenv import load_dotenv
+from fastapi import Depends
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session
 
@@ -24,12 +26,9 @@ from src.core.ports import IDocumentParser
 from src.core.repositories import IDocumentRepository
 from src.services.ports import IExtractionService
 from src.services.services import ExtractionService
-from src.adapters.parsers.pdf_parser import PdfParser
-from src.adapters.parsers.docx_parser import DocxParser
-from src.adapters.parsers.generic_text_parser import GenericTextParser
-from src.adapters.parsers.html_parser import HtmlParser
 from src.adapters.repositories import SqlDocumentRepository
 from src.adapters.database.models import Base, DocumentRecord
+from src.adapters.serialization import dump_json_str
 
 # Load environment variables
 load_dotenv()
@@ -47,28 +46,57 @@ if not all([DB_HOST, DB_PORT, DB_NAME, DB_USER, DB_PASSWORD]):
 
 DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
+# Connection pool per process (size it so WORKERS * (pool size + overflow) stays under
+# the server's max_connections)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "40"))
+
 # Database setup
-engine = create_engine(DATABASE_URL)
+# Bulk inserts (e.g. normalized table rows) are sent as multi-row INSERT ... VALUES
+# statements of up to 10k rows instead of the default 1k.
+# Pooled connections are checked before use and replaced every 30 minutes, so
+# connections dropped while idle don't fail requests; JIT is off because its
+# compile time outweighs the gain on the service's short queries.
+# JSON columns are written with the service's orjson serializer, which also handles
+# pandas Timestamps in tabular records.
+engine = create_engine(
+    DATABASE_URL,
+    executemany_mode="values_plus_batch",
+    insertmanyvalues_page_size=10000,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_pre_ping=True,
+    pool_recycle=1800,
+    connect_args={"options": "-c jit=off", "application_name": "data-extraction"},
+    json_serializer=dump_json_str
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-# Create database tables
-logging.info("Initializing database tables...")
-Base.metadata.create_all(bind=engine)
-
-# Initialize PostgreSQL Full-Text Search
-try:
-    from src.adapters.database.init_fts import initialize_fts, update_existing_search_vectors
-    db_session = SessionLocal()
+def init_database():
+    """
+    Create missing tables and set up full-text search (extensions, indexes, migrations).
     
-    initialize_fts(db_session)
-    update_existing_search_vectors(db_session)
-    db_session.close()
-    logging.info("Database and FTS initialization completed successfully")
-except Exception as e:
-    logging.warning(f"FTS initialization failed: {e}")
-    logging.info("Database initialization completed successfully (without FTS)")
-
-
+    Runs once from the application entry point rather than at import time: API
+    workers, Celery workers and extraction pool processes all import this module.
+    """
+    logging.info("Initializing database tables...")
+    Base.metadata.create_all(bind=engine)
+    
+    # Initialize PostgreSQL Full-Text Search
+    from src.adapters.database.init_fts import initialize_fts, SchemaMigrationError
+    try:
+        db_session = SessionLocal()
+        
+        initialize_fts(db_session)
+        db_session.close()
+        logging.info("Database and FTS initialization completed successfully")
+    except SchemaMigrationError:
+        # e.g. no unique deduplication index: every upload upsert would fail
+        logging.exception("Database initialization failed")
+        raise
+    except Exception as e:
+        logging.warning(f"FTS initialization failed: {e}")
+        logging.info("Database initialization completed successfully (without FTS)")
 
 def get_db() -> Generator[Session, None, None]:
     """
@@ -97,22 +125,65 @@ def get_document_repository(db: Session = None) -> IDocumentRepository:
         db = next(get_db())
     return SqlDocumentRepository(db)
 
-def get_parser_map() -> Dict[str, IDocumentParser]:
+# Parser factories. Each parser (and the libraries its module imports, e.g. PyMuPDF
+# for PDFs) is created on first use, once per process.
+@functools.lru_cache(maxsize=None)
+def _pdf_parser() -> IDocumentParser:
+    from src.adapters.parsers.pdf_parser import PdfParser
+    return PdfParser()
+
+@functools.lru_cache(maxsize=None)
+def _docx_parser() -> IDocumentParser:
+    from src.adapters.parsers.docx_parser import DocxParser
+    return DocxParser()
+
+@functools.lru_cache(maxsize=None)
+def _html_parser() -> IDocumentParser:
+    from src.adapters.parsers.html_parser import HtmlParser
+    return HtmlParser()
+
+@functools.lru_cache(maxsize=None)
+def _generic_parser() -> IDocumentParser:
+    from src.adapters.parsers.generic_text_parser import GenericTextParser
+    return GenericTextParser()
+
+class LazyParserMap(Mapping):
+    """Read-only mapping of file extensions to parsers, created by their factory on first lookup."""
+    
+    def __init__(self, factories: Mapping[str, Callable[[], IDocumentParser]]):
+        self._factories = factories
+    
+    def __getitem__(self, extension: str) -> IDocumentParser:
+        return self._factories[extension]()
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._factories)
+    
+    def __len__(self) -> int:
+        return len(self._factories)
+
+@functools.lru_cache(maxsize=None)
+def get_parser_map() -> Mapping[str, IDocumentParser]:
     """
     Create and return a mapping of file extensions to their respective parsers.
     Supports a wide variety of text-based file formats including programming languages,
     markup files, configuration files, and documentation formats.
     
+    Parsers hold no per-request state between calls, so the map is built once per
+    process and shared by all extraction services. Parsers are only created when an
+    extension that uses them is looked up.
+    
     Returns:
-        Dict[str, IDocumentParser]: Mapping of file extensions to parser instances
+        Mapping[str, IDocumentParser]: Read-only mapping of file extensions to parser instances
     """
-    # Create parser instances
-    pdf_parser = PdfParser()
-    docx_parser = DocxParser()
-    generic_parser = GenericTextParser()
-    html_parser = HtmlParser()
+    # Parser factories
+    pdf_parser = _pdf_parser
+    docx_parser = _docx_parser
+    generic_parser = _generic_parser
+    html_parser = _html_parser
     
-    return {
+    # The cached map is shared, so it is read-only
+    return LazyParserMap({
         # Document formats
         ".pdf": pdf_parser,
         ".docx": docx_parser,
@@ -221,7 +292,7 @@ def get_parser_map() -> Dict[str, IDocumentParser]:
         ".changelog": generic_parser,
         ".authors": generic_parser,
         ".contributors": generic_parser,
-    }
+    })
 
 def get_extraction_service(db: Session = None) -> IExtractionService:
     """
@@ -234,4 +305,16 @@ def get_extraction_service(db: Session = None) -> IExtractionService:
         IExtractionService: Configured extraction service instance
     """
     repository = get_document_repository(db)
-    return ExtractionService(parser_map=get_parser_map(), repository=repository)
\ No newline at end of file
+    return ExtractionService(parser_map=get_parser_map(), repository=repository)
+
+async def extraction_service_dep(db: Session = Depends(get_db)) -> IExtractionService:
+    """
+    FastAPI dependency providing an extraction service bound to the request's session.
+    
+    Args:
+        db (Session): Request-scoped database session
+        
+    Returns:
+        IExtractionService: Configured extraction service instance
+    """
+    return get_extraction_service(db)
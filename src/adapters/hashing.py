@@ -0,0 +1,49 @@
+# src/adapters/hashing.py
+"""
+Content hashing used for document deduplication.
+
+The hash only needs to identify re-uploads of the same file, so a fast
+non-cryptographic hash (xxHash3-64) is used instead of SHA-256. Falls back
+to a 64-bit BLAKE2b digest when the xxhash package is not installed.
+Documents stored by earlier versions are keyed by SHA-256 (see
+compute_legacy_file_hash).
+"""
+
+import hashlib
+
+# Hex length of the SHA-256 file hashes stored by earlier versions
+LEGACY_FILE_HASH_LENGTH = 64
+
+
+def compute_legacy_file_hash(content: bytes) -> str:
+    """Compute the SHA-256 hex digest that earlier versions stored as the file hash."""
+    return hashlib.sha256(content).hexdigest()
+
+
+try:
+    import xxhash
+
+    def new_file_hasher():
+        """Create an incremental hasher for streaming file content."""
+        return xxhash.xxh3_64()
+
+    def compute_file_hash(content: bytes) -> str:
+        """Compute the deduplication hash of file content as a hex string."""
+        return xxhash.xxh3_64_hexdigest(content)
+
+    def compute_content_key(content: bytes) -> int:
+        """Compute the same hash as an integer, for in-memory cache keys."""
+        return xxhash.xxh3_64_intdigest(content)
+
+except ImportError:
+    def new_file_hasher():
+        """Create an incremental hasher for streaming file content."""
+        return hashlib.blake2b(digest_size=8)
+
+    def compute_file_hash(content: bytes) -> str:
+        """Compute the deduplication hash of file content as a hex string."""
+        return hashlib.blake2b(content, digest_size=8).hexdigest()
+
+    def compute_content_key(content: bytes) -> int:
+        """Compute the same hash as an integer, for in-memory cache keys."""
+        return int.from_bytes(hashlib.blake2b(content, digest_size=8).digest(), 'big')
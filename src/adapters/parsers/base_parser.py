@@ -7,10 +7,170 @@ All concrete parsers should inherit from BaseParser to ensure consistent behavio
 """
 
 from abc import ABC, abstractmethod
-from typing import Tuple, List, Optional
+from collections import OrderedDict
+from concurrent.futures import Executor
+from typing import Any, Callable, Hashable, Tuple, List, Optional
 import asyncio
+import contextlib
+import functools
+import os
+import threading
 from src.core.ports import IDocumentParser
 from src.core.models import DocumentTable
+from src.adapters.hashing import compute_content_key
+
+# Parser results kept per process (re-uploads and retries of a file skip parsing)
+PARSER_CACHE_SIZE = int(os.getenv('PARSER_CACHE_SIZE', 32))
+
+
+class ParserCache:
+    """
+    Thread-safe LRU cache of parser results, keyed by the content hash of the parsed bytes.
+    """
+    
+    def __init__(self, max_size: int = PARSER_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+    
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the cached result for key, computing and storing it on a miss."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return self._entries[key]
+            self._misses += 1
+        
+        # Computed outside the lock, so parsing doesn't serialize other lookups
+        result = compute()
+        if self.max_size > 0:
+            with self._lock:
+                self._entries[key] = result
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+        return result
+    
+    def cache_info(self) -> dict:
+        """Hit/miss counters and current size, for observability."""
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+            }
+    
+    def clear(self):
+        """Drop all cached results."""
+        with self._lock:
+            self._entries.clear()
+
+
+parser_cache = ParserCache()
+
+# File signatures recognized by detect_file_signature: magic numbers and
+# byte order marks, looked up by prefix length (longest first)
+_FILE_SIGNATURES = {
+    b'%PDF': 'pdf',
+    b'PK\x03\x04': 'zip',
+    b'\xef\xbb\xbf': 'utf8_bom',
+    b'\xff\xfe': 'utf16',
+    b'\xfe\xff': 'utf16',
+}
+# Bytes at the start of a file that signature detection looks at
+FILE_SIGNATURE_HEAD_SIZE = 1000
+_FILE_SIGNATURE_LENGTHS = sorted({len(prefix) for prefix in _FILE_SIGNATURES}, reverse=True)
+# Office Open XML formats are zip archives told apart by their top-level directory
+_ZIP_SIGNATURES = (
+    (b'word/', 'docx'),
+    (b'xl/', 'xlsx'),
+    (b'ppt/', 'pptx'),
+)
+
+
+def detect_file_signature(content: bytes) -> str:
+    """
+    Detect a file's format from its signature.
+    Only the first FILE_SIGNATURE_HEAD_SIZE bytes are inspected, so content can
+    also be just the head of a file, or an mmap of it.
+    
+    Args:
+        content: Document content as bytes (or an mmap.mmap)
+        
+    Returns:
+        File signature string ('pdf', 'docx', 'xlsx', 'pptx', 'utf8_bom', 'utf16'),
+        'unknown', or "" for empty content
+    """
+    if not content:
+        return ""
+    
+    # One dict lookup per prefix length, however many signatures are known
+    for length in _FILE_SIGNATURE_LENGTHS:
+        signature = _FILE_SIGNATURES.get(content[:length])
+        if signature:
+            break
+    else:
+        return 'unknown'
+    
+    if signature == 'zip':
+        # Searched in place, without copying a slice
+        for directory, zip_signature in _ZIP_SIGNATURES:
+            if content.find(directory, 0, FILE_SIGNATURE_HEAD_SIZE) != -1:
+                return zip_signature
+        return 'unknown'
+    return signature
+
+
+# Content whose cache key is bound by content_cache_key, per thread: [content, key]
+_bound_content_key = threading.local()
+
+
+@contextlib.contextmanager
+def content_cache_key(content: bytes, file_hash: Optional[str] = None):
+    """
+    Hash content for the parser cache at most once for the cached methods called on
+    it inside the block, instead of once per call.
+    
+    Args:
+        content: Document content the parser methods will be called with
+        file_hash: Hex hash of content computed while uploading (Document.file_hash),
+            reused as the key; content is hashed lazily if it is None
+    """
+    previous = getattr(_bound_content_key, 'binding', None)
+    # The hex file hash and compute_content_key are the same digest
+    _bound_content_key.binding = [content, int(file_hash, 16) if file_hash else None]
+    try:
+        yield
+    finally:
+        _bound_content_key.binding = previous
+
+
+def _content_key(content: bytes) -> int:
+    """Cache key of content, taken from the binding of content_cache_key when it applies."""
+    binding = getattr(_bound_content_key, 'binding', None)
+    if binding is None or binding[0] is not content:
+        return compute_content_key(content)
+    if binding[1] is None:
+        binding[1] = compute_content_key(content)
+    return binding[1]
+
+
+def _cached_by_content(method: Callable) -> Callable:
+    """Cache a parser method's result by the hash and size of the content it is given."""
+    @functools.wraps(method)
+    def wrapper(self, content: bytes, *args, **kwargs):
+        # With caching disabled the content isn't hashed at all
+        if args or kwargs or parser_cache.max_size <= 0:
+            return method(self, content, *args, **kwargs)
+        key = (method.__qualname__, _content_key(content), len(content))
+        result = parser_cache.get_or_compute(key, lambda: method(self, content))
+        # Callers get their own list; the cached tables are never modified in place
+        return list(result) if isinstance(result, list) else result
+    return wrapper
 
 
 class BaseParser(IDocumentParser, ABC):
@@ -24,9 +184,17 @@ class BaseParser(IDocumentParser, ABC):
     - Async processing support
     """
     
+    # Methods whose results are cached in parser_cache, wrapped in every concrete parser
+    CACHED_METHODS = ("parse", "count_pages", "extract_tables")
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name in BaseParser.CACHED_METHODS:
+            if name in cls.__dict__:
+                setattr(cls, name, _cached_by_content(cls.__dict__[name]))
+    
     def __init__(self):
         """Initialize base parser."""
-        self._encoding_cache = {}
     
     @abstractmethod
     def parse(self, content: bytes) -> Tuple[str, bool, str]:
@@ -67,31 +235,53 @@ class BaseParser(IDocumentParser, ABC):
         """
         pass
     
-    async def parse_async(self, content: bytes) -> Tuple[str, bool, str]:
+    async def parse_async(self, content: bytes, executor: Optional[Executor] = None) -> Tuple[str, bool, str]:
         """
         Parse document asynchronously.
         
         Args:
             content: Document content as bytes
+            executor: Executor to parse in. Parsing is CPU-bound, so pass a
+                ProcessPoolExecutor to use several cores; defaults to the loop's
+                thread pool
             
         Returns:
             Tuple of (extracted_text, used_ocr, processing_method)
         """
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, self.parse, content)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, self.parse, content)
+    
+    async def parse_batch_async(self, contents: List[bytes], executor: Optional[Executor] = None) -> List[Any]:
+        """
+        Parse several documents concurrently.
+        
+        Args:
+            contents: Contents of the documents as bytes
+            executor: Executor to parse in (see parse_async)
+            
+        Returns:
+            List with the (extracted_text, used_ocr, processing_method) tuple of each
+            document, in order, or the exception its parse raised
+        """
+        loop = asyncio.get_running_loop()
+        return await asyncio.gather(
+            *(loop.run_in_executor(executor, self.parse, content) for content in contents),
+            return_exceptions=True
+        )
     
-    async def extract_tables_async(self, content: bytes) -> List[DocumentTable]:
+    async def extract_tables_async(self, content: bytes, executor: Optional[Executor] = None) -> List[DocumentTable]:
         """
         Extract tables asynchronously.
         
         Args:
             content: Document content as bytes
+            executor: Executor to extract in (see parse_async)
             
         Returns:
             List of DocumentTable objects
         """
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, self.extract_tables, content)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, self.extract_tables, content)
     
     def _create_table_text(self, headers: Optional[List[str]], rows: List[List[str]]) -> str:
         """
@@ -104,12 +294,9 @@ class BaseParser(IDocumentParser, ABC):
         Returns:
             Searchable text representation
         """
-        text = ""
-        if headers:
-            text += " | ".join(headers) + "\n"
-        for row in rows:
-            text += " | ".join(row) + "\n"
-        return text
+        lines = [" | ".join(headers)] if headers else []
+        lines.extend([" | ".join(row) for row in rows])
+        return "\n".join(lines) + "\n" if lines else ""
     
     def _validate_content(self, content: bytes) -> bool:
         """
@@ -121,36 +308,5 @@ class BaseParser(IDocumentParser, ABC):
         Returns:
             True if content is valid
         """
-        if not content:
-            return False
-        
-        # Check minimum size (avoid empty files)
-        if len(content) < 10:
-            return False
-        
-        return True
-    
-    def _get_file_signature(self, content: bytes) -> str:
-        """
-        Get file signature from content.
-        
-        Args:
-            content: Document content as bytes
-            
-        Returns:
-            File signature string
-        """
-        if not content:
-            return ""
-        
-        # Check common file signatures
-        if content.startswith(b'%PDF'):
-            return 'pdf'
-        elif content.startswith(b'PK\x03\x04') and b'word/' in content[:1000]:
-            return 'docx'
-        elif content.startswith(b'\xff\xfe') or content.startswith(b'\xfe\xff'):
-            return 'utf16'
-        elif content.startswith(b'\xef\xbb\xbf'):
-            return 'utf8_bom'
-        
-        return 'unknown'
\ No newline at end of file
+        # Check minimum size (avoid empty files); one length check covers empty content too
+        return content is not None and len(content) >= 10
\ No newline at end of file
@@ -1,12 +1,126 @@
 # src/infrastructure/repositories.py
+import io
 import os
+import csv
+import itertools
+from collections import Counter
 from typing import List, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, undefer_group
 from sqlalchemy import or_, text, func
+from sqlalchemy.exc import IntegrityError
 
 from src.core.repositories import IDocumentRepository
-from src.core.models import Document, ExtractedData
-from src.adapters.database.models import DocumentRecord
+from src.core.models import Document, ExtractedData, DocumentSummary
+from src.adapters.database.models import DocumentRecord, DocumentTableRow
+from src.adapters.hashing import compute_file_hash, compute_legacy_file_hash, LEGACY_FILE_HASH_LENGTH
+from src.adapters.serialization import dump_json_str
+
+# Sizes of the documents still keyed by a legacy SHA-256 hash (size -> count),
+# loaded once per process and shrunk as documents are re-keyed
+_legacy_file_sizes: Optional[Counter] = None
+
+def rekey_legacy_document(db: Session, content: bytes, file_hash: str) -> bool:
+    """
+    Move a document stored under the SHA-256 hash of earlier versions to file_hash,
+    so lookups and ON CONFLICT upserts by the current hash find it.
+    
+    Called when a lookup by file_hash misses. Only content with the size of a
+    legacy-keyed document is hashed with SHA-256, so once none remain (or none
+    match in size) a miss costs no hashing. The update is left for the caller to
+    commit. Returns True if a document was re-keyed.
+    """
+    global _legacy_file_sizes
+    if _legacy_file_sizes is None:
+        _legacy_file_sizes = Counter(db.execute(
+            text("SELECT file_size FROM documents WHERE length(file_hash) = :length"),
+            {"length": LEGACY_FILE_HASH_LENGTH}
+        ).scalars())
+    file_size = len(content)
+    if not _legacy_file_sizes.get(file_size):
+        return False
+    
+    rekeyed = db.query(DocumentRecord).filter(
+        DocumentRecord.file_hash == compute_legacy_file_hash(content),
+        DocumentRecord.file_size == file_size
+    ).update({DocumentRecord.file_hash: file_hash}, synchronize_session=False)
+    if rekeyed:
+        _legacy_file_sizes[file_size] -= rekeyed
+        if _legacy_file_sizes[file_size] <= 0:
+            del _legacy_file_sizes[file_size]
+    return rekeyed > 0
+
+# Columns loaded for list and search results; full_text and tables_data are left in the database
+SUMMARY_COLUMNS = (
+    DocumentRecord.id,
+    DocumentRecord.filename,
+    DocumentRecord.author,
+    DocumentRecord.page_count,
+    DocumentRecord.has_ocr_content,
+    DocumentRecord.processing_method,
+    DocumentRecord.table_count,
+    DocumentRecord.created_at,
+)
+
+# Characters of table text kept for search; search_vector indexes at most 900KB of text
+TABLES_TEXT_MAX_LENGTH = 900000
+# Cell values of a table's header/row 'rows' included in its search text
+TABLES_TEXT_MAX_CELLS = 1000
+
+def build_tables_text(tables_data: Optional[list]) -> Optional[str]:
+    """
+    Flatten the searchable content of tables_data (titles, headers, row cells and
+    key-value records) into the tables_text column the generated search_vector indexes.
+    """
+    if not tables_data:
+        return None
+    
+    parts = []
+    for table in tables_data:
+        if not isinstance(table, dict):
+            continue
+        parts.append(str(table.get("title") or ""))
+        parts.extend(str(header) for header in table.get("headers") or [])
+        cells = (cell for row in table.get("rows") or [] for cell in row if cell is not None)
+        parts.extend(str(cell) for cell in itertools.islice(cells, TABLES_TEXT_MAX_CELLS))
+        if table.get("data"):
+            parts.append(dump_json_str(table["data"]))
+    return " ".join(parts)[:TABLES_TEXT_MAX_LENGTH]
+
+# Records per COPY when normalizing table rows
+TABLE_ROW_COPY_BATCH_SIZE = 10000
+
+def store_table_rows(db: Session, document_id: int, tables_data: Optional[list]):
+    """
+    Replace the normalized rows of a document's tables with the key-value 'data'
+    records of tables_data. Rows are bulk-loaded with COPY, one CSV batch of
+    TABLE_ROW_COPY_BATCH_SIZE records at a time. The caller commits.
+    """
+    db.execute(DocumentTableRow.__table__.delete().where(DocumentTableRow.document_id == document_id))
+    
+    rows = (
+        (
+            document_id, table["table_index"], row_index,
+            dump_json_str(record)
+        )
+        for table in tables_data or []
+        if isinstance(table, dict) and table.get("table_index") is not None
+        for row_index, record in enumerate(table.get("data") or [])
+    )
+    
+    # COPY runs on the session's connection, so it is part of the caller's transaction
+    cursor = db.connection().connection.cursor()
+    try:
+        while batch := list(itertools.islice(rows, TABLE_ROW_COPY_BATCH_SIZE)):
+            buffer = io.StringIO()
+            csv.writer(buffer, lineterminator="\n").writerows(batch)
+            buffer.seek(0)
+            cursor.copy_expert(
+                f"COPY {DocumentTableRow.__tablename__} (document_id, table_index, row_index, row_data) "
+                "FROM STDIN WITH (FORMAT csv)",
+                buffer
+            )
+    finally:
+        cursor.close()
 
 class SqlDocumentRepository(IDocumentRepository):
     """
@@ -18,17 +132,18 @@ class SqlDocumentRepository(IDocumentRepository):
         self.db = db_session
     
     def save_extracted_data(self, document: Document, extracted_data: ExtractedData) -> int:
-        """Save document with compression and deduplication."""
-        import hashlib
-        import gzip
-        
-        # Calculate file hash for deduplication
-        file_hash = hashlib.sha256(document.content).hexdigest()
-        
-        # Check for existing document
-        existing = self.db.query(DocumentRecord).filter(
-            DocumentRecord.file_hash == file_hash
-        ).first()
+        """Save document with deduplication."""
+        # Calculate file hash for deduplication (unless computed during upload)
+        file_hash = document.file_hash or compute_file_hash(document.content)
+        
+        # Check for existing document (size check guards against hash collisions)
+        existing_query = self.db.query(DocumentRecord).filter(
+            DocumentRecord.file_hash == file_hash,
+            DocumentRecord.file_size == len(document.content)
+        )
+        existing = existing_query.first()
+        if existing is None and rekey_legacy_document(self.db, document.content, file_hash):
+            existing = existing_query.first()
         
         if existing:
             # Update existing document with new extraction results
@@ -39,36 +154,15 @@ class SqlDocumentRepository(IDocumentRepository):
         _, file_ext = os.path.splitext(document.filename)
         file_size = len(document.content)
         
-        # Skip compression for faster processing
-        compressed_text = None
-        
-        # Create database record
-        db_document = DocumentRecord(
-            filename=document.filename,
-            file_extension=file_ext.lower(),
-            file_size=file_size,
-            file_hash=file_hash,
-            full_text=extracted_data.full_text,  # Complete extracted text
-            full_text_compressed=compressed_text,  # Compressed version for storage efficiency
-            page_count=extracted_data.page_count,
-            word_count=len(extracted_data.full_text.split()),
-            author=extracted_data.author,
-            has_ocr_content=1 if extracted_data.has_ocr_content else 0,
-            processing_method=extracted_data.processing_method,
-            table_count=extracted_data.table_count
-        )
-        
-        # Save to database
-        self.db.add(db_document)
-        self.db.flush()  # Get the document ID
-        
-        # Save tables as JSON if any
+        # Convert tables before the INSERT, so the row is written (and its search vector
+        # generated) only once
         import logging
         logger = logging.getLogger(__name__)
         
         logger.info(f"Checking for table data in extracted_data")
         logger.info(f"Has _raw_tables attribute: {hasattr(extracted_data, '_raw_tables')}")
         
+        converted_tables = None
         if hasattr(extracted_data, '_raw_tables'):
             logger.info(f"_raw_tables length: {len(extracted_data._raw_tables) if extracted_data._raw_tables else 0}")
             logger.info(f"_raw_tables type: {type(extracted_data._raw_tables)}")
@@ -82,11 +176,10 @@ class SqlDocumentRepository(IDocumentRepository):
                     data_records = []
                     if table_dict.get('headers') and table_dict.get('rows'):
                         headers = table_dict['headers']
-                        rows = table_dict['rows']
-                        for row in rows:
-                            if len(row) == len(headers):
-                                record = {header: (value if value is not None else None) for header, value in zip(headers, row)}
-                                data_records.append(record)
+                        column_count = len(headers)
+                        data_records = [
+                            dict(zip(headers, row)) for row in table_dict['rows'] if len(row) == column_count
+                        ]
                     
                     # Create new table structure with only key-value format
                     new_table = {
@@ -104,38 +197,51 @@ class SqlDocumentRepository(IDocumentRepository):
                         "extraction_method": table_dict.get("extraction_method")
                     }
                     converted_tables.append(new_table)
-                
-                db_document.tables_data = converted_tables
             else:
                 logger.warning("_raw_tables is empty")
         else:
             logger.warning("No _raw_tables attribute found")
         
-        self.db.commit()
+        # Create database record
+        db_document = DocumentRecord(
+            filename=document.filename,
+            file_extension=file_ext.lower(),
+            file_size=file_size,
+            file_hash=file_hash,
+            full_text=extracted_data.full_text,  # Complete extracted text
+            page_count=extracted_data.page_count,
+            word_count=len(extracted_data.full_text.split()),
+            author=extracted_data.author,
+            has_ocr_content=bool(extracted_data.has_ocr_content),
+            processing_method=extracted_data.processing_method,
+            tables_data=converted_tables,  # All tables as JSON
+            tables_text=build_tables_text(converted_tables),  # Indexed by the generated search_vector
+            table_count=extracted_data.table_count
+        )
         
-        # Update the search vector using PostgreSQL's built-in FTS
-        self._update_search_vector(db_document.id)
+        # Save to database; the INSERT returns the generated id. It runs in a savepoint:
+        # a concurrent upload of the same file may have inserted it since the lookup
+        try:
+            with self.db.begin_nested():
+                self.db.add(db_document)
+                self.db.flush()
+        except IntegrityError:
+            existing = existing_query.one()
+            document_id = self._update_existing_document(existing, document, extracted_data)
+            return {"id": document_id, "action": "updated"}
+        document_id = db_document.id
         
-        self.db.refresh(db_document)
-        return {"id": db_document.id, "action": "created"}
-    
-    def _update_search_vector(self, document_id: int):
-        """Update the full-text search vector for a document."""
-        update_query = text("""
-            UPDATE documents 
-            SET search_vector = to_tsvector('english', 
-                coalesce(filename, '') || ' ' || 
-                coalesce(full_text, '') || ' ' || 
-                coalesce(author, '')
-            )
-            WHERE id = :doc_id
-        """)
-        self.db.execute(update_query, {"doc_id": document_id})
+        if converted_tables:
+            store_table_rows(self.db, document_id, converted_tables)
+        
+        # One commit; search_vector is generated by PostgreSQL, and the id was read
+        # before committing, so the expired instance doesn't need a refresh
         self.db.commit()
+        return {"id": document_id, "action": "created"}
     
     def get_by_id(self, document_id: int) -> Optional[ExtractedData]:
         """Get document by ID with tables."""
-        db_document = self.db.query(DocumentRecord).filter(
+        db_document = self.db.query(DocumentRecord).options(undefer_group("content")).filter(
             DocumentRecord.id == document_id
         ).first()
         
@@ -146,23 +252,23 @@ class SqlDocumentRepository(IDocumentRepository):
     
     def get_by_filename(self, filename: str) -> List[ExtractedData]:
         """Get all documents with the given filename."""
-        db_documents = self.db.query(DocumentRecord).filter(
+        db_documents = self.db.query(DocumentRecord).options(undefer_group("content")).filter(
             DocumentRecord.filename == filename
         ).all()
         
         return [self._to_domain_model(doc) for doc in db_documents]
     
-    def get_all(self, limit: int = 100, offset: int = 0) -> List[ExtractedData]:
+    def get_all(self, limit: int = 100, offset: int = 0) -> List[DocumentSummary]:
         """Get all documents with pagination."""
-        db_documents = self.db.query(DocumentRecord)\
+        rows = self.db.query(*SUMMARY_COLUMNS)\
             .order_by(DocumentRecord.created_at.desc())\
             .offset(offset)\
             .limit(limit)\
             .all()
         
-        return [self._to_domain_model(doc) for doc in db_documents]
+        return [self._to_summary(row) for row in rows]
     
-    def search_by_text(self, search_term: str, limit: int = 100) -> List[ExtractedData]:
+    def search_by_text(self, search_term: str, limit: int = 100) -> List[DocumentSummary]:
         """
         Advanced search using PostgreSQL Full-Text Search.
         Supports phrase queries, boolean operators, and ranking.
@@ -179,10 +285,11 @@ class SqlDocumentRepository(IDocumentRepository):
         
         # Use PostgreSQL's full-text search with ranking
         search_query = text("""
-            SELECT *, ts_rank(search_vector, to_tsquery('english', :query)) as rank
+            SELECT id, filename, author, page_count, has_ocr_content, processing_method,
+                   table_count, created_at
             FROM documents 
             WHERE search_vector @@ to_tsquery('english', :query)
-            ORDER BY rank DESC, created_at DESC
+            ORDER BY ts_rank(search_vector, to_tsquery('english', :query)) DESC, created_at DESC
             LIMIT :limit
         """)
         
@@ -192,27 +299,16 @@ class SqlDocumentRepository(IDocumentRepository):
                 "limit": limit
             })
             
-            # Convert results to domain models
-            documents = []
-            for row in result:
-                # Create a DocumentRecord-like object from the row
-                db_document = DocumentRecord()
-                for column in DocumentRecord.__table__.columns:
-                    if hasattr(row, column.name):
-                        setattr(db_document, column.name, getattr(row, column.name))
-                
-                documents.append(self._to_domain_model(db_document))
-            
-            return documents
+            return [self._to_summary(row) for row in result]
             
         except Exception as e:
             print(f"FTS search failed, falling back to ILIKE: {e}")
             # Fallback to ILIKE search if FTS fails
             return self._fallback_search(search_term, limit)
     
-    def _fallback_search(self, search_term: str, limit: int = 100) -> List[ExtractedData]:
+    def _fallback_search(self, search_term: str, limit: int = 100) -> List[DocumentSummary]:
         """Fallback search using ILIKE when FTS fails."""
-        db_documents = self.db.query(DocumentRecord).filter(
+        rows = self.db.query(*SUMMARY_COLUMNS).filter(
             or_(
                 DocumentRecord.full_text.ilike(f"%{search_term}%"),
                 DocumentRecord.filename.ilike(f"%{search_term}%"),
@@ -220,23 +316,36 @@ class SqlDocumentRepository(IDocumentRepository):
             )
         ).order_by(DocumentRecord.created_at.desc()).limit(limit).all()
         
-        return [self._to_domain_model(doc) for doc in db_documents]
+        return [self._to_summary(row) for row in rows]
     
-    def search_by_processing_method(self, method: str, limit: int = 100) -> List[ExtractedData]:
+    def search_by_processing_method(self, method: str, limit: int = 100) -> List[DocumentSummary]:
         """Search documents by processing method (text_extraction, ocr, hybrid)."""
-        db_documents = self.db.query(DocumentRecord).filter(
+        rows = self.db.query(*SUMMARY_COLUMNS).filter(
             DocumentRecord.processing_method == method
         ).order_by(DocumentRecord.created_at.desc()).limit(limit).all()
         
-        return [self._to_domain_model(doc) for doc in db_documents]
+        return [self._to_summary(row) for row in rows]
     
-    def get_ocr_documents(self, limit: int = 100) -> List[ExtractedData]:
+    def get_ocr_documents(self, limit: int = 100) -> List[DocumentSummary]:
         """Get all documents that used OCR processing."""
-        db_documents = self.db.query(DocumentRecord).filter(
-            DocumentRecord.has_ocr_content == 1
+        rows = self.db.query(*SUMMARY_COLUMNS).filter(
+            DocumentRecord.has_ocr_content.is_(True)
         ).order_by(DocumentRecord.created_at.desc()).limit(limit).all()
         
-        return [self._to_domain_model(doc) for doc in db_documents]
+        return [self._to_summary(row) for row in rows]
+    
+    def _to_summary(self, row) -> DocumentSummary:
+        """Convert a row of SUMMARY_COLUMNS to a document summary."""
+        return DocumentSummary(
+            id=row.id,
+            filename=row.filename,
+            author=row.author,
+            page_count=row.page_count or 1,
+            has_ocr_content=bool(row.has_ocr_content),
+            processing_method=row.processing_method,
+            table_count=row.table_count or 0,
+            created_at=row.created_at
+        )
     
     def _to_domain_model(self, db_document: DocumentRecord) -> ExtractedData:
         """Convert database model to domain model with tables from JSON."""
@@ -372,21 +481,17 @@ class SqlDocumentRepository(IDocumentRepository):
         Returns:
             Document ID of updated record
         """
-        import gzip
         from datetime import datetime
         
         # Update the existing record with new data
         existing.filename = document.filename  # Update filename in case it changed
         existing.full_text = extracted_data.full_text
         
-        # Skip compression for faster processing
-        existing.full_text_compressed = None
-        
         # Update extraction metadata
         existing.page_count = extracted_data.page_count
         existing.word_count = len(extracted_data.full_text.split())
         existing.author = extracted_data.author
-        existing.has_ocr_content = 1 if extracted_data.has_ocr_content else 0
+        existing.has_ocr_content = bool(extracted_data.has_ocr_content)
         existing.processing_method = extracted_data.processing_method
         existing.table_count = extracted_data.table_count
         existing.updated_at = datetime.utcnow()
@@ -435,25 +540,17 @@ class SqlDocumentRepository(IDocumentRepository):
             logger.warning("No _raw_tables found in update, setting to None")
             existing.tables_data = None
         
-        # Update search vector for full-text search
-        if existing.full_text:
-            try:
-                from sqlalchemy import text
-                update_search_vector = text("""
-                    UPDATE documents 
-                    SET search_vector = to_tsvector('english', :full_text)
-                    WHERE id = :doc_id
-                """)
-                self.db.execute(update_search_vector, {
-                    "full_text": existing.full_text,
-                    "doc_id": existing.id
-                })
-            except Exception as e:
-                print(f"Warning: Failed to update search vector: {e}")
-        
-        # Commit the update
+        existing.tables_text = build_tables_text(existing.tables_data)
+        
+        document_id = existing.id
+        store_table_rows(self.db, document_id, existing.tables_data)
+        
+        # Read before committing; the committed instance is expired and would be reloaded
+        summary = f"Method: {existing.processing_method}, OCR: {bool(existing.has_ocr_content)}, Tables: {existing.table_count}"
+        
+        # Commit the update (PostgreSQL regenerates the search vector)
         self.db.commit()
         
-        print(f"Document updated with ID: {existing.id} (Method: {existing.processing_method}, OCR: {bool(existing.has_ocr_content)}, Tables: {existing.table_count})")
+        print(f"Document updated with ID: {document_id} ({summary})")
         
-        return existing.id
\ No newline at end of file
+        return document_id
\ No newline at end of file
@@ -0,0 +1,32 @@
+# src/adapters/serialization.py
+"""
+JSON serialization shared by API responses and database writes.
+
+Uses orjson with the service's options: non-string keys (e.g. numeric column
+names) are converted like json.dumps does, numpy values from pandas are supported,
+and types orjson doesn't handle natively go through json_default.
+"""
+
+from datetime import date, datetime
+from decimal import Decimal
+
+import orjson
+
+def json_default(value):
+    """
+    Serialize types orjson doesn't support natively: NUMERIC values from SQL, and
+    datetime subclasses such as pandas Timestamps in tabular records.
+    """
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+def dump_json(value, option: int = 0) -> bytes:
+    """Serialize a value to JSON bytes with orjson and the service's options."""
+    return orjson.dumps(value, default=json_default, option=option | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+def dump_json_str(value) -> str:
+    """Serialize a value to a JSON string (e.g. for JSON columns and COPY rows)."""
+    return dump_json(value).decode()
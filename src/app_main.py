@@ -58,12 +58,15 @@ def initialize_application():
     
     try:
         # Import here to ensure environment is set up first
-        from src.adapters.dependencies import engine
+        from src.adapters.dependencies import engine, init_database
         
         # Test database connection
         with engine.connect() as conn:
             logger.info("Database connection established")
         
+        # Create tables and FTS setup once, before the server workers start
+        init_database()
+        
         logger.info("Application initialization completed")
         return True
         
@@ -85,6 +88,7 @@ def start_server():
             host=config.app.host,
             port=config.app.port,
             reload=config.app.reload,
+            workers=None if config.app.reload else config.app.workers,
             log_level=config.app.log_level,
             access_log=True
         )
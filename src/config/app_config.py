@@ -63,6 +63,7 @@ class AppConfig:
     host: str = os.getenv('HOST', '0.0.0.0')
     port: int = int(os.getenv('PORT', 8000))
     reload: bool = os.getenv('RELOAD', 'false').lower() == 'true'
+    workers: int = int(os.getenv('WORKERS', '1'))  # Uvicorn worker processes (ignored with reload)
     log_level: str = os.getenv('LOG_LEVEL', 'info')
     log_to_file: bool = os.getenv('LOG_TO_FILE', 'false').lower() == 'true'
     fast_mode: bool = os.getenv('FAST_MODE', 'true').lower() == 'true'
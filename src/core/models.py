@@ -62,7 +62,19 @@ class ExtractedData(BaseModel):
     filename: Optional[str] = None
     created_at: Optional[datetime] = None
 
+class DocumentSummary(BaseModel):
+    """Document metadata for list and search results (no full text or table data)."""
+    id: int
+    filename: str
+    author: Optional[str] = None
+    page_count: int = 1
+    has_ocr_content: bool = False
+    processing_method: Optional[str] = None
+    table_count: int = 0
+    created_at: Optional[datetime] = None
+
 class Document(BaseModel):
     """Internal representation of a document."""
     content: bytes
-    filename: str
\ No newline at end of file
+    filename: str
+    file_hash: Optional[str] = None            # Deduplication hash if computed while uploading
\ No newline at end of file
@@ -1,7 +1,7 @@
 # src/domain/repositories.py
 from abc import ABC, abstractmethod
 from typing import List, Optional
-from .models import Document, ExtractedData
+from .models import Document, ExtractedData, DocumentSummary
 
 class IDocumentRepository(ABC):
     """
@@ -28,21 +28,21 @@ class IDocumentRepository(ABC):
         pass
     
     @abstractmethod
-    def get_all(self, limit: int = 100, offset: int = 0) -> List[ExtractedData]:
+    def get_all(self, limit: int = 100, offset: int = 0) -> List[DocumentSummary]:
         """Get all documents with pagination."""
         pass
     
     @abstractmethod
-    def search_by_text(self, search_term: str, limit: int = 100) -> List[ExtractedData]:
+    def search_by_text(self, search_term: str, limit: int = 100) -> List[DocumentSummary]:
         """Search documents by text content using PostgreSQL FTS."""
         pass
     
     @abstractmethod
-    def search_by_processing_method(self, method: str, limit: int = 100) -> List[ExtractedData]:
+    def search_by_processing_method(self, method: str, limit: int = 100) -> List[DocumentSummary]:
         """Search documents by processing method (text_extraction, ocr, hybrid)."""
         pass
     
     @abstractmethod
-    def get_ocr_documents(self, limit: int = 100) -> List[ExtractedData]:
+    def get_ocr_documents(self, limit: int = 100) -> List[DocumentSummary]:
         """Get all documents that used OCR processing."""
         pass
\ No newline at end of file
@@ -1,7 +1,7 @@
 # src/application/ports.py
 from abc import ABC, abstractmethod
 from typing import Optional
-from src.core.models import Document, ExtractedData
+from src.core.models import Document, ExtractedData, DocumentSummary
 
 class IExtractionService(ABC):
     """
@@ -17,17 +17,17 @@ class IExtractionService(ABC):
         pass
     
     @abstractmethod
-    def search_documents(self, search_term: str, limit: int = 100) -> list[ExtractedData]:
+    def search_documents(self, search_term: str, limit: int = 100) -> list[DocumentSummary]:
         pass
     
     @abstractmethod
-    def get_all_documents(self, limit: int = 100, offset: int = 0) -> list[ExtractedData]:
+    def get_all_documents(self, limit: int = 100, offset: int = 0) -> list[DocumentSummary]:
         pass
     
     @abstractmethod
-    def get_documents_by_processing_method(self, method: str, limit: int = 100) -> list[ExtractedData]:
+    def get_documents_by_processing_method(self, method: str, limit: int = 100) -> list[DocumentSummary]:
         pass
     
     @abstractmethod
-    def get_ocr_documents(self, limit: int = 100) -> list[ExtractedData]:
+    def get_ocr_documents(self, limit: int = 100) -> list[DocumentSummary]:
         pass
\ No newline at end of file
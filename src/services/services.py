@@ -1,15 +1,26 @@
 # src/application/services.py
-from src.core.models import Document, ExtractedData, DocumentTable
+from src.core.models import Document, ExtractedData, DocumentSummary, DocumentTable
 from typing import List
 from src.core.ports import IDocumentParser
 from src.core.repositories import IDocumentRepository
 from src.services.ports import IExtractionService
-from typing import Dict, Optional
+from typing import Dict, Mapping, Optional
 import os
 import logging
+import functools
 
 logger = logging.getLogger(__name__)
 
+# Extensions of extensionless uploads, by the file signature detected in their content
+SIGNATURE_EXTENSIONS = {'pdf': '.pdf', 'docx': '.docx'}
+
+@functools.lru_cache(maxsize=None)
+def _fallback_parser() -> IDocumentParser:
+    """Generic text parser for unknown extensions, created once per process."""
+    # Import here to avoid circular imports
+    from src.adapters.parsers.generic_text_parser import GenericTextParser
+    return GenericTextParser()
+
 class ExtractionService(IExtractionService):
     """
     This is the core application logic.
@@ -17,7 +28,7 @@ class ExtractionService(IExtractionService):
     It depends on the IDocumentParser interface and IDocumentRepository.
     """
     
-    def __init__(self, parser_map: Dict[str, IDocumentParser], repository: IDocumentRepository):
+    def __init__(self, parser_map: Mapping[str, IDocumentParser], repository: IDocumentRepository):
         self._parser_map = parser_map
         self._repository = repository
 
@@ -28,10 +39,8 @@ class ExtractionService(IExtractionService):
         """
         parser = self._parser_map.get(file_extension)
         if not parser:
-            # Import here to avoid circular imports
-            from src.adapters.parsers.generic_text_parser import GenericTextParser
             # Fall back to generic text parser for unknown file types
-            return GenericTextParser()
+            return _fallback_parser()
         return parser
 
     def extract_from_document(self, doc: Document) -> ExtractedData:
@@ -39,6 +48,15 @@ class ExtractionService(IExtractionService):
         Orchestrates the extraction process and saves to database.
         Supports any text-based file format with intelligent fallback parsing.
         """
+        # Import here to avoid circular imports
+        from src.adapters.parsers.base_parser import content_cache_key
+        
+        # The parser methods share one cache key, taken from the upload hash when known
+        with content_cache_key(doc.content, doc.file_hash):
+            return self._extract_from_document(doc)
+    
+    def _extract_from_document(self, doc: Document) -> ExtractedData:
+        """Parse doc, extract its tables and save the results (see extract_from_document)."""
         _, file_ext = os.path.splitext(doc.filename)
         file_ext = file_ext.lower()
         
@@ -111,7 +129,7 @@ class ExtractionService(IExtractionService):
             extracted_data = ExtractedData(
                 full_text=sanitized_text,
                 page_count=page_count,
-                has_ocr_content=1 if used_ocr else 0,  # Convert boolean to integer
+                has_ocr_content=used_ocr,
                 processing_method=processing_method,
                 tables=[],  # We'll store tables as raw data in the database
                 table_count=len(tables)
@@ -142,7 +160,7 @@ class ExtractionService(IExtractionService):
             return ExtractedData(
                 full_text=f"Error processing document: {str(e)}",
                 page_count=1,
-                has_ocr_content=0,  # Convert boolean False to integer 0
+                has_ocr_content=False,
                 processing_method="error",
                 tables=[],
                 table_count=0
@@ -229,11 +247,13 @@ class ExtractionService(IExtractionService):
         
         # Try to detect based on content
         try:
+            # Import here to avoid circular imports
+            from src.adapters.parsers.base_parser import detect_file_signature
+            
             # Check first few bytes for common signatures
-            if content.startswith(b'%PDF'):
-                return '.pdf'
-            elif content.startswith(b'PK\x03\x04') and b'word/' in content[:1000]:
-                return '.docx'
+            extension = SIGNATURE_EXTENSIONS.get(detect_file_signature(content))
+            if extension:
+                return extension
             elif content.startswith(b'{\n') or content.startswith(b'[\n'):
                 return '.json'
             elif content.startswith(b'<'):
@@ -248,18 +268,18 @@ class ExtractionService(IExtractionService):
         """Retrieve a document by its ID."""
         return self._repository.get_by_id(document_id)
     
-    def search_documents(self, search_term: str, limit: int = 100) -> list[ExtractedData]:
+    def search_documents(self, search_term: str, limit: int = 100) -> list[DocumentSummary]:
         """Search documents by text content."""
         return self._repository.search_by_text(search_term, limit)
     
-    def get_all_documents(self, limit: int = 100, offset: int = 0) -> list[ExtractedData]:
+    def get_all_documents(self, limit: int = 100, offset: int = 0) -> list[DocumentSummary]:
         """Get all documents with pagination."""
         return self._repository.get_all(limit, offset)
     
-    def get_documents_by_processing_method(self, method: str, limit: int = 100) -> list[ExtractedData]:
+    def get_documents_by_processing_method(self, method: str, limit: int = 100) -> list[DocumentSummary]:
         """Get documents by processing method."""
         return self._repository.search_by_processing_method(method, limit)
     
-    def get_ocr_documents(self, limit: int = 100) -> list[ExtractedData]:
+    def get_ocr_documents(self, limit: int = 100) -> list[DocumentSummary]:
         """Get all documents that used OCR."""
         return self._repository.get_ocr_documents(limit)
\ No newline at end of file
@@ -89,31 +89,29 @@ class TabularProcessor:
             return pd.read_excel(io.BytesIO(content))
             
         elif file_type == 'tsv':
-            text_content = content.decode('utf-8')
-            return pd.read_csv(io.StringIO(text_content), sep='\t')
+            return pd.read_csv(io.BytesIO(content), sep='\t')
             
         elif file_type == 'csv':
-            text_content = content.decode('utf-8')
-            
-            # Auto-detect delimiter
+            # Auto-detect delimiter (counted on the raw bytes, without decoding the whole file)
             delimiter = ','
-            if text_content.count(';') > text_content.count(','):
+            comma_count = content.count(b',')
+            if content.count(b';') > comma_count:
                 delimiter = ';'
-            elif text_content.count('\t') > text_content.count(','):
+            elif content.count(b'\t') > comma_count:
                 delimiter = '\t'
-            elif text_content.count('|') > text_content.count(','):
+            elif content.count(b'|') > comma_count:
                 delimiter = '|'
             
             # Try parsing with robust error handling
             try:
                 # First attempt: strict parsing
-                return pd.read_csv(io.StringIO(text_content), sep=delimiter)
+                return pd.read_csv(io.BytesIO(content), sep=delimiter)
             except Exception as e:
                 logger.warning(f"CSV parsing failed with strict mode: {e}")
                 # Second attempt: flexible parsing
                 try:
                     return pd.read_csv(
-                        io.StringIO(text_content), 
+                        io.BytesIO(content), 
                         sep=delimiter,
                         skipinitialspace=True,  # Skip spaces after delimiter
                         skip_blank_lines=True,  # Skip empty lines
@@ -123,7 +121,7 @@ class TabularProcessor:
                     logger.warning(f"CSV parsing failed with flexible mode: {e2}")
                     # Third attempt: most permissive parsing
                     return pd.read_csv(
-                        io.StringIO(text_content), 
+                        io.BytesIO(content), 
                         sep=delimiter,
                         quoting=3,              # No quoting
                         skipinitialspace=True,
@@ -142,21 +140,20 @@ class TabularProcessor:
             from src.config.app_config import config
             max_rows = config.large_file.max_storage_rows
         
-        # Replace NaN values with None for JSON serialization
-        df_clean = df.replace({np.nan: None})
-        
         # For large datasets, only store a sample to prevent browser crashes
         if len(df) > max_rows:
             # Store only a sample of the data + metadata
-            sample_df = df_clean.head(max_rows)
-            data_records = sample_df.to_dict('records')
+            sample_df = df.head(max_rows)
             is_truncated = True
             logger.warning(f"Large dataset detected ({len(df)} rows). Storing only first {max_rows} rows to prevent memory issues.")
         else:
             # Store full dataset for smaller files
-            data_records = df_clean.to_dict('records')
+            sample_df = df
             is_truncated = False
         
+        # Replace NaN values with None for JSON serialization (only on the rows that are stored)
+        data_records = sample_df.replace({np.nan: None}).to_dict('records')
+        
         return {
             "table_index": 0,
             "page_number": 1,
@@ -171,7 +168,7 @@ class TabularProcessor:
             "confidence_score": 1.0,
             "extraction_method": f"{file_type}_parser",
             "data_quality_score": 1.0,
-            "column_types": {col: str(df[col].dtype) for col in df.columns}
+            "column_types": df.dtypes.astype(str).to_dict()
         }
     
     @staticmethod
@@ -193,12 +190,12 @@ class TabularProcessor:
     def analyze_data_quality(df: pd.DataFrame) -> Dict:
         """Analyze data quality metrics"""
         # Convert numpy types to Python types for JSON serialization
-        null_counts = df.isnull().sum()
-        data_types = df.dtypes
+        # (count() reduces each column directly, without a full boolean frame like isnull())
+        null_counts = len(df) - df.count()
         
         return {
             "null_counts": {str(k): int(v) for k, v in null_counts.items()},
             "duplicate_rows": int(df.duplicated().sum()),
             "memory_usage_mb": round(df.memory_usage(deep=True).sum() / 1024**2, 2),
-            "data_types": {str(k): str(v) for k, v in data_types.items()}
+            "data_types": {str(k): v for k, v in df.dtypes.astype(str).items()}
         }
\ No newline at end of file
@@ -0,0 +1,84 @@
+# tests/test_api.py
+from unittest import mock
+
+from sqlalchemy.dialects import postgresql
+
+from src.adapters import api
+
+TABLES_DATA = [{"table_index": 0, "data": [{"name": "alice"}]}]
+
+
+def _document_values(**values) -> dict:
+    return {
+        "filename": "people.csv",
+        "file_extension": ".csv",
+        "file_size": 12,
+        "file_hash": "0123456789abcdef",
+        "full_text": "",
+        "tables_data": TABLES_DATA,
+        "table_count": 1,
+        **values,
+    }
+
+
+def _session_returning(row):
+    """A session mock whose upsert statement returns row (or no row for DO NOTHING duplicates)."""
+    db = mock.MagicMock()
+    db.execute.return_value.first.return_value = row
+    return db
+
+
+def _executed_sql(db) -> str:
+    statement = db.execute.call_args.args[0]
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def test_upsert_document_reports_insert():
+    db = _session_returning((7, True))
+
+    with mock.patch.object(api, "store_table_rows") as store_rows:
+        assert api._upsert_document(db, _document_values()) == (7, True)
+
+    sql = _executed_sql(db)
+    assert "ON CONFLICT (file_hash, file_size) DO NOTHING" in sql
+    assert "xmax = 0" in sql
+    store_rows.assert_called_once_with(db, 7, TABLES_DATA)
+    db.commit.assert_called_once()
+
+
+def test_upsert_document_reports_update():
+    db = _session_returning((7, False))
+
+    with mock.patch.object(api, "store_table_rows") as store_rows:
+        result = api._upsert_document(db, _document_values(), update_fields=("tables_data", "table_count"))
+
+    assert result == (7, False)
+    sql = _executed_sql(db)
+    assert "ON CONFLICT (file_hash, file_size) DO UPDATE" in sql
+    assert "tables_text" in sql.split("DO UPDATE")[1]
+    # Updated table data replaces the document's normalized rows
+    store_rows.assert_called_once_with(db, 7, TABLES_DATA)
+    db.commit.assert_called_once()
+
+
+def test_upsert_document_returns_existing_duplicate():
+    db = _session_returning(None)
+    existing = mock.Mock(id=3)
+
+    with mock.patch.object(api, "store_table_rows") as store_rows, \
+            mock.patch.object(api, "_find_document_by_hash", return_value=existing) as find_document:
+        assert api._upsert_document(db, _document_values()) == (3, False)
+
+    find_document.assert_called_once_with(db, "0123456789abcdef", 12)
+    store_rows.assert_not_called()
+
+
+def test_upsert_document_rekeys_legacy_hash_before_insert():
+    db = _session_returning((7, False))
+    content = b"name\nalice\n"
+
+    with mock.patch.object(api, "store_table_rows"), \
+            mock.patch.object(api, "rekey_legacy_document") as rekey:
+        api._upsert_document(db, _document_values(), content=content)
+
+    rekey.assert_called_once_with(db, content, "0123456789abcdef")
@@ -0,0 +1,70 @@
+# tests/test_repositories.py
+import csv
+import io
+from unittest import mock
+
+import orjson
+
+from src.adapters import repositories
+from src.adapters.repositories import store_table_rows
+
+TABLES_DATA = [
+    {"table_index": 0, "data": [{"name": "alice", "score": 3}, {"name": "bob", "score": 5}]},
+    {"table_index": 1, "data": [{"city": "Oslo"}]},
+    {"data": [{"skipped": True}]},  # No table_index: not stored as rows
+]
+
+
+def _session_with_copy_capture():
+    """A session mock whose COPY calls record the CSV they were given."""
+    db = mock.MagicMock()
+    cursor = db.connection.return_value.connection.cursor.return_value
+    copied = []
+    cursor.copy_expert.side_effect = lambda sql, buffer: copied.append((sql, buffer.getvalue()))
+    return db, cursor, copied
+
+
+def _copied_rows(copied):
+    rows = []
+    for _, payload in copied:
+        for document_id, table_index, row_index, row_data in csv.reader(io.StringIO(payload)):
+            rows.append((int(document_id), int(table_index), int(row_index), orjson.loads(row_data)))
+    return rows
+
+
+def test_store_table_rows_replaces_rows_with_copy():
+    db, cursor, copied = _session_with_copy_capture()
+
+    store_table_rows(db, 42, TABLES_DATA)
+
+    # Existing rows of the document are deleted before the new ones are copied in
+    db.execute.assert_called_once()
+    assert len(copied) == 1
+    assert "COPY document_table_rows (document_id, table_index, row_index, row_data)" in copied[0][0]
+    assert _copied_rows(copied) == [
+        (42, 0, 0, {"name": "alice", "score": 3}),
+        (42, 0, 1, {"name": "bob", "score": 5}),
+        (42, 1, 0, {"city": "Oslo"}),
+    ]
+    cursor.close.assert_called_once()
+    db.commit.assert_not_called()
+
+
+def test_store_table_rows_copies_in_batches():
+    db, _, copied = _session_with_copy_capture()
+
+    with mock.patch.object(repositories, "TABLE_ROW_COPY_BATCH_SIZE", 2):
+        store_table_rows(db, 7, TABLES_DATA)
+
+    assert len(copied) == 2
+    assert [row[:3] for row in _copied_rows(copied)] == [(7, 0, 0), (7, 0, 1), (7, 1, 0)]
+
+
+def test_store_table_rows_without_tables_only_deletes():
+    db, cursor, copied = _session_with_copy_capture()
+
+    store_table_rows(db, 7, None)
+
+    db.execute.assert_called_once()
+    assert copied == []
+    cursor.close.assert_called_once()
@@ -0,0 +1,38 @@
+# tests/test_tabular_processor.py
+import orjson
+
+from src.services.tabular_processor import TabularProcessor
+from src.adapters.serialization import dump_json, dump_json_str
+
+# ISO-8601 dates must be stored as they appear in the file, not as timestamps
+CSV_WITH_DATES = b"name,joined,score\nalice,2024-01-15,3\nbob,2023-11-02,5\n"
+
+
+def _load_table(content: bytes) -> dict:
+    df = TabularProcessor.load_dataframe(content, "csv", "people.csv")
+    return TabularProcessor.create_table_data(df, "csv", "people.csv", max_rows=100)
+
+
+def test_csv_date_column_keeps_stored_values():
+    table = _load_table(CSV_WITH_DATES)
+
+    records = orjson.loads(dump_json(table["data"]))
+    assert [record["name"] for record in records] == ["alice", "bob"]
+    assert [record["joined"] for record in records] == ["2024-01-15", "2023-11-02"]
+    assert records[1]["score"] == 5
+
+
+def test_csv_date_column_types_unchanged():
+    df = TabularProcessor.load_dataframe(CSV_WITH_DATES, "csv", "people.csv")
+
+    assert df.dtypes.astype(str).to_dict() == {"name": "object", "joined": "object", "score": "int64"}
+
+
+def test_csv_date_column_stored_table_text():
+    from src.adapters.repositories import build_tables_text
+
+    table = _load_table(CSV_WITH_DATES)
+
+    # The same serializer writes JSON columns and normalized table rows
+    assert "2023-11-02" in dump_json_str(table)
+    assert "2024-01-15" in build_tables_text([table])